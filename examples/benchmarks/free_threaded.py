@@ -0,0 +1,84 @@
+"""
+Throughput of a sync container used from several threads.
+
+Run it with a free-threaded build of python (e.g. `python3.13t`) to see
+how resolution scales when the GIL is disabled. With GIL enabled numbers
+stay almost the same for any number of threads.
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NewType
+
+from dishka import Container, Provider, Scope, make_container, provide
+
+Config = NewType("Config", dict)
+Pool = NewType("Pool", list)
+Cache = NewType("Cache", dict)
+
+
+class Service:
+    def __init__(self, config: Config, pool: Pool, cache: Cache) -> None:
+        self.config = config
+        self.pool = pool
+        self.cache = cache
+
+
+class Handler:
+    def __init__(self, service: Service, pool: Pool) -> None:
+        self.service = service
+        self.pool = pool
+
+
+class BenchProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_config(self) -> Config:
+        return Config({})
+
+    @provide(scope=Scope.APP)
+    def get_pool(self, config: Config) -> Pool:
+        return Pool([config])
+
+    @provide(scope=Scope.APP)
+    def get_cache(self) -> Cache:
+        return Cache({})
+
+    service = provide(Service, scope=Scope.APP)
+    handler = provide(Handler, scope=Scope.REQUEST)
+
+
+ITERATIONS = 20_000
+THREADS = (1, 2, 4, 8, 16, 32)
+
+
+def work(container: Container) -> None:
+    for _ in range(ITERATIONS):
+        container.get(Service)
+        with container() as request_container:
+            request_container.get(Handler)
+
+
+def measure(container: Container, threads: int) -> float:
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(work, container) for _ in range(threads)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return threads * ITERATIONS / elapsed
+
+
+def main() -> None:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    print(f"GIL enabled: {is_gil_enabled()}")
+    print("threads  default  free_threaded  (requests per second)")
+    for threads in THREADS:
+        default = measure(make_container(BenchProvider()), threads)
+        free_threaded = measure(
+            make_container(BenchProvider(), free_threaded=True), threads,
+        )
+        print(f"{threads:7}  {default:7.0f}  {free_threaded:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,10 @@ __all__ = [
     "Component",
     "Container",
     "DependencyKey",
+    "FinalizationSettings",
     "FromComponent",
     "FromDishka",
+    "LeakTracker",
     "Provider",
     "Scope",
     "ValidationSettings",
@@ -27,11 +29,13 @@ from .async_container import AsyncContainer, make_async_container
 from .container import Container, make_container
 from .entities.component import DEFAULT_COMPONENT, Component
 from .entities.depends_marker import FromDishka
+from .entities.finalization_settings import FinalizationSettings
 from .entities.key import DependencyKey, FromComponent
 from .entities.provides_marker import AnyOf
 from .entities.scope import BaseScope, Scope, new_scope
 from .entities.validation_settigs import STRICT_VALIDATION, ValidationSettings
 from .entities.with_parents import WithParents
+from .leak_tracker import LeakTracker
 from .provider import (
     Provider,
     alias,
@@ -1,29 +1,51 @@
 from __future__ import annotations
 
 import warnings
-from asyncio import Lock
-from collections.abc import Callable, MutableMapping
+from asyncio import (
+    AbstractEventLoop,
+    Lock,
+    get_running_loop,
+    run_coroutine_threadsafe,
+)
+from collections.abc import Callable, Iterable, MutableMapping, Sequence
 from contextlib import AbstractAsyncContextManager
+from threading import RLock
 from types import TracebackType
 from typing import Any, TypeVar, cast, overload
 
 from dishka.entities.component import DEFAULT_COMPONENT, Component
-from dishka.entities.factory_type import FactoryType
 from dishka.entities.key import DependencyKey
 from dishka.entities.scope import BaseScope, Scope
-from .container_objects import Exit
-from .context_proxy import ContextProxy
+from .async_lock import MultiLoopLock
+from .concurrent_resolution import resolve_concurrently
+from .container_objects import (
+    EMPTY_CONTEXT,
+    MISSING,
+    CompiledAsyncFactory,
+    CompiledFactory,
+    ContainerPool,
+    Exit,
+)
+from .context_proxy import CacheView, ContextProxy
 from .dependency_source import Factory
+from .entities.finalization_settings import (
+    DEFAULT_FINALIZATION,
+    FinalizationSettings,
+)
 from .entities.validation_settigs import DEFAULT_VALIDATION, ValidationSettings
 from .exceptions import (
     ChildScopeNotFoundError,
     ExitError,
+    FrozenContainerError,
     NoChildScopesError,
+    NoContextValueError,
     NoFactoryError,
     NoNonSkippedScopesError,
 )
+from .finalization import finalize
+from .leak_tracker import LeakTracker
 from .provider import BaseProvider
-from .registry import Registry
+from .registry import LockPolicy, Registry, skip_collapsed
 from .registry_builder import RegistryBuilder
 
 T = TypeVar("T")
@@ -31,9 +53,14 @@ T = TypeVar("T")
 
 class AsyncContainer:
     __slots__ = (
+        "__weakref__",
         "_cache",
         "_context",
         "_exits",
+        "_frozen",
+        "_key_locks",
+        "_lock_factory",
+        "_sync_lock",
         "child_registries",
         "close_parent",
         "lock",
@@ -51,28 +78,66 @@ class AsyncContainer:
                 [], AbstractAsyncContextManager[Any],
             ] | None = None,
             close_parent: bool = False,
+            lock_per_key: bool = False,
     ):
+        if lock_per_key and registry.inline_compilation:
+            raise ValueError(  # noqa: TRY003
+                "Locking per key cannot be used with inline compilation",
+            )
         self.registry = registry
         self.child_registries = child_registries
-        self._context = {CONTAINER_KEY: self}
-        if context:
-            for key, value in context.items():
-                if not isinstance(key, DependencyKey):
-                    key = DependencyKey(  # noqa: PLW2901
-                        key,
-                        DEFAULT_COMPONENT,
-                    )
-                self._context[key] = value
-        self._cache = {**self._context}
+        # container itself is resolved by key, so it does not
+        # reference itself and is freed right after it is closed.
+        # Empty context is shared between containers, so it is replaced
+        # with own dict before deprecated `context` property changes it
+        self._context = registry.make_context(context)
+        self._cache = registry.make_cache(self._context)
         self.parent_container = parent_container
 
-        self.lock: AbstractAsyncContextManager[Any] | None
-        if lock_factory:
-            self.lock = lock_factory()
-        else:
-            self.lock = None
-        self._exits: list[Exit] = []
+        self.lock: AbstractAsyncContextManager[Any] | None = None
+        # with locking per key container lock is not used
+        self._key_locks: dict[
+            DependencyKey, AbstractAsyncContextManager[Any],
+        ] | None = None
+        self._lock_factory: Callable[
+            [], AbstractAsyncContextManager[Any],
+        ] | None = None
+        self._init_locks(lock_factory, lock_per_key=lock_per_key)
+        self._exits: list[Exit] | None = None
+        if registry.has_finalizers:
+            self._exits = []
         self.close_parent = close_parent
+        # created objects by key when the container is frozen
+        self._frozen: dict[DependencyKey, Any] | None = None
+        # guards synchronous creation when used from other threads
+        self._sync_lock: RLock | None = None
+        if registry.leak_tracker is not None:
+            registry.leak_tracker.track(self)
+
+    def _init_locks(
+            self,
+            lock_factory: Callable[
+                [], AbstractAsyncContextManager[Any],
+            ] | None,
+            *,
+            lock_per_key: bool,
+    ) -> None:
+        registry = self.registry
+        if registry.scope in registry.lock_policy:
+            lock_factory = registry.lock_policy[registry.scope]
+        if (
+            self._lock_factory is lock_factory
+            and (self._key_locks is not None) is lock_per_key
+        ):
+            # locks of reused container are not held, so they are kept
+            return
+        self._lock_factory = lock_factory
+        self.lock = None
+        self._key_locks = None
+        if lock_factory and lock_per_key:
+            self._key_locks = {}
+        elif lock_factory:
+            self.lock = lock_factory()
 
     @property
     def scope(self) -> BaseScope:
@@ -85,7 +150,14 @@ class AsyncContainer:
             DeprecationWarning,
             stacklevel=2,
         )
-        return ContextProxy(cache=self._cache, context=self._context)
+        context = self._context
+        if not isinstance(context, dict):
+            # shared empty context is copied before it can be changed
+            context = self._context = dict(context)
+        return ContextProxy(
+            cache=CacheView(self.registry, self._cache, context),
+            context=context,
+        )
 
     def __call__(
             self,
@@ -94,45 +166,62 @@ class AsyncContainer:
                 [], AbstractAsyncContextManager[Any],
             ] | None = None,
             scope: BaseScope | None = None,
+            *,
+            lock_per_key: bool = False,
     ) -> AsyncContextWrapper:
         """
         Prepare container for entering the inner scope.
         :param context: Data which will available in inner scope
         :param lock_factory: Callable to create lock instance or None
         :param scope: target scope or None to enter next non-skipped scope
+        :param lock_per_key: create separate lock for each dependency
+            instead of locking the whole container
         :return: async context manager for inner scope
         """
         if not self.child_registries:
             raise NoChildScopesError
-
+        pool = self.child_registries[0].pool
+        if scope is None and pool is not None:
+            wrapper = pool.acquire()
+            if wrapper is not None:
+                wrapper.container._reuse(  # noqa: SLF001
+                    self, context, lock_factory, lock_per_key=lock_per_key,
+                )
+                return cast(AsyncContextWrapper, wrapper)
+        registries = self.child_registries
+        if scope is None:
+            registries = skip_collapsed(registries)
         child = AsyncContainer(
-            *self.child_registries,
+            *registries,
             parent_container=self,
             context=context,
             lock_factory=lock_factory,
+            lock_per_key=lock_per_key,
         )
         if scope is None:
             while child.registry.scope.skip:
                 if not child.child_registries:
                     raise NoNonSkippedScopesError
                 child = AsyncContainer(
-                    *child.child_registries,
-                    parent_container=child,
-                    context=context,
-                    lock_factory=lock_factory,
-                    close_parent=True,
-                )
-        else:
-            while child.registry.scope is not scope:
-                if not child.child_registries:
-                    raise ChildScopeNotFoundError(scope, self.registry.scope)
-                child = AsyncContainer(
-                    *child.child_registries,
+                    *skip_collapsed(child.child_registries),
                     parent_container=child,
                     context=context,
                     lock_factory=lock_factory,
                     close_parent=True,
+                    lock_per_key=lock_per_key,
                 )
+            return AsyncContextWrapper(child, pool)
+        while child.registry.scope is not scope:
+            if not child.child_registries:
+                raise ChildScopeNotFoundError(scope, self.registry.scope)
+            child = AsyncContainer(
+                *child.child_registries,
+                parent_container=child,
+                context=context,
+                lock_factory=lock_factory,
+                close_parent=True,
+                lock_per_key=lock_per_key,
+            )
         return AsyncContextWrapper(child)
 
     @overload
@@ -156,25 +245,167 @@ class AsyncContainer:
             dependency_type: Any,
             component: Component | None = DEFAULT_COMPONENT,
     ) -> Any:
+        key = self.registry.keys.get(dependency_type, component)
+        solved = self._get_cached(key)
+        if solved is not MISSING:
+            return solved
+        if key in self.registry.sync_subgraphs:
+            # no awaits are done, so no other task can interfere
+            return self._get_sync_unlocked(key)
+        owner = self.registry.owners.get(key)
+        if owner is not None:
+            # objects of parent scopes are locked only by their container
+            return await self._get_from_owner(key, owner)
         lock = self.lock
-        key = DependencyKey(dependency_type, component)
         if not lock:
             return await self._get_unlocked(key)
         async with lock:
+            # cache is checked again, so object is created only once
             return await self._get_unlocked(key)
 
+    async def get_many(self, dependencies: Iterable[Any]) -> tuple[Any, ...]:
+        """
+        Get several dependencies at once.
+
+        :param dependencies: type hints or `DependencyKey` instances
+            for non-default components
+        :return: tuple of resolved objects in the same order
+        """
+        from_dependency = self.registry.keys.from_dependency
+        keys = [from_dependency(dependency) for dependency in dependencies]
+        lock = self.lock
+        if not lock:
+            return await self._get_many_unlocked(keys)
+        async with lock:
+            return await self._get_many_unlocked(keys)
+
+    async def _get_many_unlocked(
+            self, keys: list[DependencyKey],
+    ) -> tuple[Any, ...]:
+        sync_subgraphs = self.registry.sync_subgraphs
+        return tuple([
+            self._get_sync_unlocked(key)
+            if key in sync_subgraphs
+            else await self._get_unlocked(key)
+            for key in keys
+        ])
+
+    def sync_view(self) -> SyncView:
+        """
+        Get synchronous facade to use container from other threads.
+
+        Must be called within the event loop of the container. Created
+        objects and synchronous dependencies are resolved in calling
+        thread, others are created in the event loop.
+        """
+        loop = get_running_loop()
+        container: AsyncContainer | None = self
+        while container is not None:
+            if container._sync_lock is None:  # noqa: SLF001
+                container._sync_lock = RLock()  # noqa: SLF001
+            container = container.parent_container
+        return SyncView(self, loop)
+
+    def freeze(self) -> None:
+        """
+        Make container read-only.
+
+        Objects created before are returned without locking using a
+        single dict lookup. Creating new objects in this container raises
+        `FrozenContainerError`, dependencies of parent scopes are still
+        requested from parent containers.
+        """
+        frozen = dict(self._context)
+        cache = self._cache
+        for key, slot in self.registry.slots.items():
+            if slot < len(cache) and cache[slot] is not MISSING:
+                frozen[key] = cache[slot]
+        self._frozen = frozen
+
+    def _get_cached(self, key: DependencyKey) -> Any:
+        # Created objects are never replaced, so they can be read
+        # without lock. MISSING is returned if object is not created yet
+        frozen = self._frozen
+        if frozen is not None:
+            return frozen.get(key, MISSING)
+        slot = self.registry.slots.get(key)
+        if slot is None:
+            return self._get_context(key)
+        cache = self._cache
+        if slot < len(cache):
+            return cache[slot]
+        return MISSING
+
+    def _get_context(self, key: DependencyKey) -> Any:
+        # container is not stored in its context to avoid reference cycle
+        if key == CONTAINER_KEY:
+            return self
+        return self._context.get(key, MISSING)
+
     async def _get_unlocked(self, key: DependencyKey) -> Any:
-        if key in self._cache:
-            return self._cache[key]
-        compiled = self.registry.get_compiled_async(key)
+        registry = self.registry
+        cache = self._cache
+        slot = registry.slots.get(key)
+        if slot is None:
+            solved = self._get_context(key)
+            if solved is not MISSING:
+                return solved
+            if key in registry.owners:
+                return await self._get_from_owner(key, registry.owners[key])
+        # slot can be added after container creation
+        elif slot < len(cache) and (solved := cache[slot]) is not MISSING:
+            return solved
+        compiled = registry.get_compiled_async(key)
         if not compiled:
-            if not self.parent_container:
-                raise NoFactoryError(key)
-            return await self.parent_container.get(
-                key.type_hint, key.component,
+            return await self._get_from_parent(key)
+        if self._frozen is not None:
+            raise FrozenContainerError(key, registry.scope)
+        if len(cache) < len(registry.slots):
+            cache.extend([MISSING] * (len(registry.slots) - len(cache)))
+        key_locks = self._key_locks
+        # Not cached objects are created on each request, so they are not
+        # locked even if they have a slot. Factories for `type[T]` are not
+        # stored in registry and are not cached as well
+        if (
+            key_locks is not None
+            and (factory := registry.factories.get(key)) is not None
+            and factory.cache
+        ):
+            return await self._create_locked(key, compiled, key_locks)
+        return await self._create(key, compiled)
+
+    async def _create_locked(
+            self,
+            key: DependencyKey,
+            compiled: CompiledAsyncFactory,
+            key_locks: dict[DependencyKey, AbstractAsyncContextManager[Any]],
+    ) -> Any:
+        # Only the first task creates an object, others wait for it.
+        # Dependencies are locked while the lock of dependant is held,
+        # graph is acyclic, so all tasks take locks in the same order
+        lock = key_locks.get(key)
+        if lock is None:
+            lock_factory = cast(
+                Callable[[], AbstractAsyncContextManager[Any]],
+                self._lock_factory,
             )
+            lock = key_locks.setdefault(key, lock_factory())
+        async with lock:
+            solved = self._cache[self.registry.slots[key]]
+            if solved is not MISSING:
+                return solved
+            return await self._create(key, compiled)
+
+    async def _create(
+            self, key: DependencyKey, compiled: CompiledAsyncFactory,
+    ) -> Any:
         try:
-            return await compiled(self._get_unlocked, self._exits, self._cache)
+            return await compiled(
+                self._get_unlocked,
+                self._exits,
+                self._cache,
+                self._get_sync_unlocked,
+            )
         except NoFactoryError as e:
             # cast is needed because registry.get_factory will always
             # return Factory. This happens because registry.get_compiled
@@ -182,22 +413,176 @@ class AsyncContainer:
             # If None is returned, then go to the parent container
             e.add_path(cast(Factory, self.registry.get_factory(key)))
             raise
+        finally:
+            # finalizers are added by compiled factories
+            if self.registry.leak_tracker is not None:
+                self._report_finalizers()
+
+    def _report_finalizers(self) -> None:
+        tracker = cast(LeakTracker, self.registry.leak_tracker)
+        if self._exits:
+            tracker.set_finalizers(self, len(self._exits))
+
+    def _get_sync_unlocked(self, key: DependencyKey) -> Any:
+        registry = self.registry
+        cache = self._cache
+        slot = registry.slots.get(key)
+        if slot is None:
+            solved = self._get_context(key)
+            if solved is not MISSING:
+                return solved
+            if key in registry.owners:
+                owner = self._find_owner(key, registry.owners[key])
+                return owner._get_sync_unlocked(key)  # noqa: SLF001
+        # slot can be added after container creation
+        elif slot < len(cache) and (solved := cache[slot]) is not MISSING:
+            return solved
+        compiled = registry.get_compiled(key)
+        if not compiled:
+            return self._get_sync_from_parent(key)
+        if self._frozen is not None:
+            raise FrozenContainerError(key, registry.scope)
+        if len(cache) < len(registry.slots):
+            cache.extend([MISSING] * (len(registry.slots) - len(cache)))
+        sync_lock = self._sync_lock
+        if sync_lock is None:
+            return self._create_sync(key, compiled)
+        return self._create_sync_locked(key, compiled, sync_lock)
+
+    def _create_sync_locked(
+            self,
+            key: DependencyKey,
+            compiled: CompiledFactory,
+            sync_lock: RLock,
+    ) -> Any:
+        with sync_lock:
+            # it could be created by another thread
+            solved = self._get_cached(key)
+            if solved is not MISSING:
+                return solved
+            return self._create_sync(key, compiled)
+
+    def _create_sync(
+            self, key: DependencyKey, compiled: CompiledFactory,
+    ) -> Any:
+        try:
+            return compiled(self._get_sync_unlocked, self._exits, self._cache)
+        except NoFactoryError as e:
+            e.add_path(cast(Factory, self.registry.get_factory(key)))
+            raise
+        finally:
+            if self.registry.leak_tracker is not None:
+                self._report_finalizers()
+
+    async def _get_from_parent(self, key: DependencyKey) -> Any:
+        if not self.parent_container:
+            raise NoFactoryError(key)
+        return await self.parent_container.get(key.type_hint, key.component)
+
+    def _get_sync_from_parent(self, key: DependencyKey) -> Any:
+        if not self.parent_container:
+            raise NoFactoryError(key)
+        return self.parent_container._get_sync_unlocked(key)  # noqa: SLF001
+
+    async def _get_from_owner(
+            self, key: DependencyKey, scope: BaseScope,
+    ) -> Any:
+        owner = self._find_owner(key, scope)
+        solved = owner._get_cached(key)  # noqa: SLF001
+        if solved is not MISSING:
+            return solved
+        lock = owner.lock
+        if not lock:
+            return await owner._get_unlocked(key)  # noqa: SLF001
+        async with lock:
+            return await owner._get_unlocked(key)  # noqa: SLF001
+
+    def _find_owner(
+            self, key: DependencyKey, scope: BaseScope,
+    ) -> AsyncContainer:
+        # parent containers without factory for the key are skipped,
+        # only context passed to them can contain it
+        container = self.parent_container
+        while container is not None and (
+            container.registry.scope is not scope
+            and key not in container._context  # noqa: SLF001
+        ):
+            container = container.parent_container
+        if container is None:
+            # container of collapsed scope is not created
+            raise NoContextValueError(key.type_hint)
+        return container
+
+    async def _create_eager(self) -> None:
+        # containers of skipped scopes are entered together with this one
+        if self.close_parent and self.parent_container:
+            await self.parent_container._create_eager()  # noqa: SLF001
+        if self.registry.eager_groups:
+            await resolve_concurrently(
+                self._get_unlocked, self._cache, self.registry.eager_groups,
+            )
+
+    def _reuse(
+            self,
+            parent_container: AsyncContainer,
+            context: dict[Any, Any] | None,
+            lock_factory: Callable[
+                [], AbstractAsyncContextManager[Any],
+            ] | None,
+            *,
+            lock_per_key: bool,
+    ) -> None:
+        # containers of skipped scopes are reused together with this one
+        container = self
+        while True:
+            container._init_locks(  # noqa: SLF001
+                lock_factory, lock_per_key=lock_per_key,
+            )
+            if context:
+                container._set_context(context)  # noqa: SLF001
+            if container.registry.leak_tracker is not None:
+                container.registry.leak_tracker.track(container)
+            if not container.close_parent:
+                break
+            container = cast(AsyncContainer, container.parent_container)
+        container.parent_container = parent_container
+
+    def _set_context(self, context: dict[Any, Any]) -> None:
+        self._context = self.registry.make_context(context)
+        self.registry.fill_cache(self._cache, self._context)
+
+    def _release(self) -> None:
+        # Drop context of closed container, so it is not kept in pool.
+        # Other cells of cache are already empty
+        container = self
+        while True:
+            slots = container.registry.slots
+            cache = container._cache  # noqa: SLF001
+            for key in container._context:  # noqa: SLF001
+                slot = slots.get(key)
+                if slot is not None:
+                    cache[slot] = MISSING
+            container._context = EMPTY_CONTEXT  # noqa: SLF001
+            if not container.close_parent:
+                break
+            container = cast(AsyncContainer, container.parent_container)
 
     async def close(self, exception: BaseException | None = None) -> None:
-        errors = []
-        for exit_generator in self._exits[::-1]:
-            try:
-                if exit_generator.type is FactoryType.ASYNC_GENERATOR:
-                    await exit_generator.callable.asend(exception) # type: ignore[attr-defined]
-                elif exit_generator.type is FactoryType.GENERATOR:
-                    exit_generator.callable.send(exception)  # type: ignore[attr-defined]
-            except StopIteration:  # noqa: PERF203
-                pass
-            except StopAsyncIteration:
-                pass
-            except Exception as err:  # noqa: BLE001
-                errors.append(err)
-        self._cache = {**self._context}
+        self._frozen = None
+        errors: list[Exception] = []
+        exits = self._exits
+        if exits:
+            errors = await finalize(
+                exits,
+                exception,
+                self.registry.finalization,
+                self.registry.factories,
+            )
+            # cache and exits are reset in place, so container can be reused
+            exits.clear()
+        self.registry.reset_cache(self._cache, self._context)
+        if self.registry.leak_tracker is not None:
+            self.registry.leak_tracker.untrack(self)
         if self.close_parent and self.parent_container:
             try:
                 await self.parent_container.close(exception)
@@ -208,10 +593,20 @@ class AsyncContainer:
 
 
 class AsyncContextWrapper:
-    def __init__(self, container: AsyncContainer):
+    def __init__(
+            self,
+            container: AsyncContainer,
+            pool: ContainerPool[AsyncContextWrapper] | None = None,
+    ):
         self.container = container
+        self.pool = pool
 
     async def __aenter__(self) -> AsyncContainer:
+        try:
+            await self.container._create_eager()  # noqa: SLF001
+        except BaseException as e:
+            await self.container.close(e)
+            raise
         return self.container
 
     async def __aexit__(
@@ -221,6 +616,59 @@ class AsyncContextWrapper:
         exc_tb: TracebackType | None = None,
     ) -> None:
         await self.container.close(exception=exc_val)
+        if self.pool is not None:
+            self.container._release()  # noqa: SLF001
+            self.pool.release(self)
+
+
+class SyncView:
+    __slots__ = ("container", "loop")
+
+    def __init__(self, container: AsyncContainer, loop: AbstractEventLoop):
+        self.container = container
+        self.loop = loop
+
+    @overload
+    def get(
+            self,
+            dependency_type: type[T],
+            component: Component | None = DEFAULT_COMPONENT,
+    ) -> T:
+        ...
+
+    @overload
+    def get(
+            self,
+            dependency_type: Any,
+            component: Component | None = DEFAULT_COMPONENT,
+    ) -> Any:
+        ...
+
+    def get(
+            self,
+            dependency_type: Any,
+            component: Component | None = DEFAULT_COMPONENT,
+    ) -> Any:
+        container = self.container
+        key = container.registry.keys.get(dependency_type, component)
+        solved = container._get_cached(key)  # noqa: SLF001
+        if solved is not MISSING:
+            return solved
+        if key in container.registry.sync_subgraphs:
+            return container._get_sync_unlocked(key)  # noqa: SLF001
+        try:
+            running_loop = get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            raise RuntimeError(  # noqa: TRY003
+                "Cannot wait for async dependency in its event loop, "
+                "use `await container.get()` instead",
+            )
+        future = run_coroutine_threadsafe(
+            container.get(dependency_type, component), self.loop,
+        )
+        return future.result()
 
 
 def make_async_container(
@@ -233,28 +681,54 @@ def make_async_container(
         skip_validation: bool = False,
         start_scope: BaseScope | None = None,
         validation_settings: ValidationSettings = DEFAULT_VALIDATION,
+        finalization_settings: FinalizationSettings = DEFAULT_FINALIZATION,
+        inline_compilation: bool = False,
+        compile_eagerly: bool = False,
+        specializations: Sequence[Any] = (),
+        concurrent: bool = False,
+        lock_per_key: bool = False,
+        lock_policy: LockPolicy | None = None,
+        multi_loop: bool = False,
+        pool_size: int = 0,
+        leak_tracker: LeakTracker | None = None,
 ) -> AsyncContainer:
+    if multi_loop and lock_factory is Lock:
+        lock_factory = MultiLoopLock
     registries = RegistryBuilder(
         scopes=scopes,
         container_key=CONTAINER_KEY,
         providers=providers,
         skip_validation=skip_validation,
         validation_settings=validation_settings,
+        finalization=finalization_settings,
+        inline_compilation=inline_compilation,
+        specializations=specializations,
+        lock_policy=lock_policy,
+        concurrent=concurrent,
+        # objects are created without lock only within a single loop
+        find_sync_subgraphs=not multi_loop,
+        pool_size=pool_size,
+        leak_tracker=leak_tracker,
     ).build()
+    if compile_eagerly:
+        for registry in registries:
+            registry.compile_all(is_async=True)
     container = AsyncContainer(
         *registries,
         context=context,
         lock_factory=lock_factory,
+        lock_per_key=lock_per_key,
     )
 
     if start_scope is None:
         while container.registry.scope.skip:
             container = AsyncContainer(
-                *container.child_registries,
+                *skip_collapsed(container.child_registries),
                 parent_container=container,
                 context=context,
                 lock_factory=lock_factory,
                 close_parent=True,
+                lock_per_key=lock_per_key,
             )
     else:
         while container.registry.scope is not start_scope:
@@ -264,6 +738,7 @@ def make_async_container(
                 context=context,
                 lock_factory=lock_factory,
                 close_parent=True,
+                lock_per_key=lock_per_key,
             )
     return container
 
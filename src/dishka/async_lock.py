@@ -0,0 +1,63 @@
+"""
+Lock for async container shared by several event loops
+
+`asyncio.Lock` is bound to the event loop which uses it first, so it
+cannot protect container used from different threads each running own
+loop. Here waiters are `concurrent.futures.Future` objects: they can be
+completed from any thread and awaited in any loop.
+"""
+from asyncio import CancelledError, wrap_future
+from collections import deque
+from concurrent.futures import Future
+from threading import Lock
+from types import TracebackType
+
+
+class MultiLoopLock:
+    __slots__ = ("_lock", "_locked", "_waiters")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._locked = False
+        self._waiters: deque[Future[None]] = deque()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if not self._locked:
+                self._locked = True
+                return
+            waiter: Future[None] = Future()
+            self._waiters.append(waiter)
+        try:
+            await wrap_future(waiter)
+        except CancelledError:
+            with self._lock:
+                # lock can be already passed to this waiter
+                owned = not waiter.cancel()
+            if owned:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                # ownership is passed to the first not cancelled waiter
+                if waiter.set_running_or_notify_cancel():
+                    waiter.set_result(None)
+                    return
+            self._locked = False
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self.release()
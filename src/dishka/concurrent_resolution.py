@@ -0,0 +1,149 @@
+"""
+Resolve dependencies of a factory concurrently in async container
+
+Dependencies are split into groups which share no cached objects, so
+each group can be resolved in a separate task without creating the same
+object twice. Dependencies within a group are resolved one by one.
+Resolved objects are saved to the container cache, so the factory
+reads them from there as usual.
+
+Sync container uses the same groups to create eager dependencies
+in threads of an executor. For warm up dependencies are created in
+threads following the graph: each one is started only when all its
+dependencies are created, so finalizers are registered in the same
+order as when they are created one by one.
+"""
+from asyncio import FIRST_EXCEPTION, ensure_future, gather, wait
+from collections.abc import Callable, Collection, Mapping, Sequence
+from concurrent import futures
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any
+
+from .container_objects import MISSING
+from .entities.key import DependencyKey
+
+ConcurrentGroup = Sequence[tuple[DependencyKey, int]]
+
+
+async def _resolve_group(
+        getter: Callable[..., Any], group: ConcurrentGroup,
+) -> None:
+    for key, _ in group:
+        await getter(key)
+
+
+async def resolve_concurrently(
+        getter: Callable[..., Any],
+        cache: list[Any],
+        groups: Sequence[ConcurrentGroup],
+) -> None:
+    pending = [
+        group
+        for group in groups
+        if any(
+            slot >= len(cache) or cache[slot] is MISSING
+            for _, slot in group
+        )
+    ]
+    if len(pending) < 2:  # noqa: PLR2004
+        for group in pending:
+            await _resolve_group(getter, group)
+        return
+
+    tasks = [ensure_future(_resolve_group(getter, group)) for group in pending]
+    try:
+        await wait(tasks, return_when=FIRST_EXCEPTION)
+    finally:
+        # stop other groups if one has failed or we are cancelled
+        for task in tasks:
+            task.cancel()
+        await gather(*tasks, return_exceptions=True)
+    for task in tasks:
+        if not task.cancelled() and (error := task.exception()):
+            raise error
+
+
+def _resolve_group_sync(
+        getter: Callable[..., Any], group: ConcurrentGroup,
+) -> None:
+    for key, _ in group:
+        getter(key)
+
+
+def resolve_in_threads(
+        getter: Callable[..., Any],
+        cache: list[Any],
+        groups: Sequence[ConcurrentGroup],
+        executor: Executor | None,
+) -> None:
+    pending = [
+        group
+        for group in groups
+        if any(
+            slot >= len(cache) or cache[slot] is MISSING
+            for _, slot in group
+        )
+    ]
+    if executor is None or len(pending) < 2:  # noqa: PLR2004
+        for group in pending:
+            _resolve_group_sync(getter, group)
+        return
+
+    tasks = [
+        executor.submit(copy_context().run, _resolve_group_sync, getter, group)
+        for group in pending
+    ]
+    try:
+        futures.wait(tasks, return_when=futures.FIRST_EXCEPTION)
+    finally:
+        # groups which are not started yet are not needed anymore
+        for task in tasks:
+            task.cancel()
+        futures.wait(tasks)
+    for task in tasks:
+        if not task.cancelled() and (error := task.exception()):
+            raise error
+
+
+def resolve_graph_in_threads(
+        getter: Callable[[DependencyKey], Any],
+        graph: Mapping[DependencyKey, Collection[DependencyKey]],
+        max_workers: int | None,
+) -> None:
+    """
+    Create dependencies in threads as soon as they are ready.
+
+    :param getter: function creating a dependency
+    :param graph: dependencies from `graph` required by each key
+    :param max_workers: max number of threads
+    """
+    waiting = {key: set(deps) for key, deps in graph.items()}
+    dependants: dict[DependencyKey, list[DependencyKey]] = {}
+    for key, deps in waiting.items():
+        for dep in deps:
+            dependants.setdefault(dep, []).append(key)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        running: dict[Future[Any], DependencyKey] = {}
+
+        def submit_ready() -> None:
+            for key, deps in list(waiting.items()):
+                if not deps:
+                    del waiting[key]
+                    task = executor.submit(copy_context().run, getter, key)
+                    running[task] = key
+
+        submit_ready()
+        while running:
+            done, _ = futures.wait(
+                running, return_when=futures.FIRST_COMPLETED,
+            )
+            for task in done:
+                key = running.pop(task)
+                if error := task.exception():
+                    futures.wait(running)
+                    raise error
+                for dependant in dependants.get(key, ()):
+                    waiting[dependant].discard(key)
+            submit_ready()
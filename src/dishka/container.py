@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import warnings
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, Iterable, MutableMapping, Sequence
+from concurrent.futures import Executor
 from contextlib import AbstractContextManager
 from threading import Lock
 from types import TracebackType
@@ -11,31 +12,61 @@ from dishka.entities.component import DEFAULT_COMPONENT, Component
 from dishka.entities.factory_type import FactoryType
 from dishka.entities.key import DependencyKey
 from dishka.entities.scope import BaseScope, Scope
-from .container_objects import Exit
-from .context_proxy import ContextProxy
+from ._adaptix.type_tools.fundamentals import get_type_vars
+from .concurrent_resolution import (
+    resolve_graph_in_threads,
+    resolve_in_threads,
+)
+from .container_objects import (
+    EMPTY_CONTEXT,
+    MISSING,
+    CompiledFactory,
+    ContainerPool,
+    Exit,
+)
+from .context_proxy import CacheView, ContextProxy
 from .dependency_source import Factory
+from .entities.finalization_settings import (
+    DEFAULT_FINALIZATION,
+    FinalizationSettings,
+)
 from .entities.validation_settigs import DEFAULT_VALIDATION, ValidationSettings
 from .exceptions import (
     ChildScopeNotFoundError,
     ExitError,
+    FrozenContainerError,
     NoChildScopesError,
+    NoContextValueError,
     NoFactoryError,
     NoNonSkippedScopesError,
 )
+from .finalization import finalize_sync
+from .leak_tracker import LeakTracker
 from .provider import BaseProvider
-from .registry import Registry
+from .registry import LockPolicy, Registry, skip_collapsed
 from .registry_builder import RegistryBuilder
 
 T = TypeVar("T")
+SYNC_TYPES = (
+    FactoryType.FACTORY,
+    FactoryType.GENERATOR,
+    FactoryType.VALUE,
+    FactoryType.ALIAS,
+)
 
 
 class Container:
     __slots__ = (
+        "__weakref__",
         "_cache",
         "_context",
         "_exits",
+        "_frozen",
+        "_key_locks",
+        "_lock_factory",
         "child_registries",
         "close_parent",
+        "eager_executor",
         "lock",
         "parent_container",
         "registry",
@@ -51,28 +82,64 @@ class Container:
                 [], AbstractContextManager[Any],
             ] | None = None,
             close_parent: bool = False,
+            lock_per_key: bool = False,
+            eager_executor: Executor | None = None,
     ):
+        if lock_per_key and registry.inline_compilation:
+            raise ValueError(  # noqa: TRY003
+                "Locking per key cannot be used with inline compilation",
+            )
         self.registry = registry
         self.child_registries = child_registries
-        self._context = {CONTAINER_KEY: self}
-        if context:
-            for key, value in context.items():
-                if not isinstance(key, DependencyKey):
-                    key = DependencyKey(  # noqa: PLW2901
-                        key,
-                        DEFAULT_COMPONENT,
-                    )
-                self._context[key] = value
-        self._cache = {**self._context}
+        # container itself is resolved by key, so it does not
+        # reference itself and is freed right after it is closed.
+        # Empty context is shared between containers, so it is replaced
+        # with own dict before deprecated `context` property changes it
+        self._context = registry.make_context(context)
+        self._cache = registry.make_cache(self._context)
         self.parent_container = parent_container
 
-        self.lock: AbstractContextManager[Any] | None
-        if lock_factory:
-            self.lock = lock_factory()
-        else:
-            self.lock = None
-        self._exits: list[Exit] = []
+        self.lock: AbstractContextManager[Any] | None = None
+        # with locking per key container lock is not used
+        self._key_locks: dict[
+            DependencyKey, AbstractContextManager[Any],
+        ] | None = None
+        self._lock_factory: Callable[
+            [], AbstractContextManager[Any],
+        ] | None = None
+        self._init_locks(lock_factory, lock_per_key=lock_per_key)
+        self._exits: list[Exit] | None = None
+        if registry.has_finalizers:
+            self._exits = []
         self.close_parent = close_parent
+        self.eager_executor = eager_executor
+        # created objects by key when the container is frozen
+        self._frozen: dict[DependencyKey, Any] | None = None
+        if registry.leak_tracker is not None:
+            registry.leak_tracker.track(self)
+
+    def _init_locks(
+            self,
+            lock_factory: Callable[[], AbstractContextManager[Any]] | None,
+            *,
+            lock_per_key: bool,
+    ) -> None:
+        registry = self.registry
+        if registry.scope in registry.lock_policy:
+            lock_factory = registry.lock_policy[registry.scope]
+        if (
+            self._lock_factory is lock_factory
+            and (self._key_locks is not None) is lock_per_key
+        ):
+            # locks of reused container are not held, so they are kept
+            return
+        self._lock_factory = lock_factory
+        self.lock = None
+        self._key_locks = None
+        if lock_factory and lock_per_key:
+            self._key_locks = {}
+        elif lock_factory:
+            self.lock = lock_factory()
 
     @property
     def scope(self) -> BaseScope:
@@ -85,7 +152,14 @@ class Container:
             DeprecationWarning,
             stacklevel=2,
         )
-        return ContextProxy(cache=self._cache, context=self._context)
+        context = self._context
+        if not isinstance(context, dict):
+            # shared empty context is copied before it can be changed
+            context = self._context = dict(context)
+        return ContextProxy(
+            cache=CacheView(self.registry, self._cache, context),
+            context=context,
+        )
 
     def __call__(
             self,
@@ -94,44 +168,65 @@ class Container:
                 [], AbstractContextManager[Any],
             ] | None = None,
             scope: BaseScope | None = None,
+            *,
+            lock_per_key: bool = False,
     ) -> ContextWrapper:
         """
         Prepare container for entering the inner scope.
         :param context: Data which will available in inner scope
         :param lock_factory: Callable to create lock instance or None
         :param scope: target scope or None to enter next non-skipped scope
+        :param lock_per_key: create separate lock for each dependency
+            instead of locking the whole container
         :return: context manager for inner scope
         """
         if not self.child_registries:
             raise NoChildScopesError
+        pool = self.child_registries[0].pool
+        if scope is None and pool is not None:
+            wrapper = pool.acquire()
+            if wrapper is not None:
+                wrapper.container._reuse(  # noqa: SLF001
+                    self, context, lock_factory, lock_per_key=lock_per_key,
+                )
+                return cast(ContextWrapper, wrapper)
+        registries = self.child_registries
+        if scope is None:
+            registries = skip_collapsed(registries)
         child = Container(
-            *self.child_registries,
+            *registries,
             parent_container=self,
             context=context,
             lock_factory=lock_factory,
+            lock_per_key=lock_per_key,
+            eager_executor=self.eager_executor,
         )
         if scope is None:
             while child.registry.scope.skip:
                 if not child.child_registries:
                     raise NoNonSkippedScopesError
                 child = Container(
-                    *child.child_registries,
-                    parent_container=child,
-                    context=context,
-                    lock_factory=lock_factory,
-                    close_parent=True,
-                )
-        else:
-            while child.registry.scope is not scope:
-                if not child.child_registries:
-                    raise ChildScopeNotFoundError(scope, self.registry.scope)
-                child = Container(
-                    *child.child_registries,
+                    *skip_collapsed(child.child_registries),
                     parent_container=child,
                     context=context,
                     lock_factory=lock_factory,
                     close_parent=True,
+                    lock_per_key=lock_per_key,
+                    eager_executor=self.eager_executor,
                 )
+            return ContextWrapper(child, pool)
+        while child.registry.scope is not scope:
+            if not child.child_registries:
+                raise ChildScopeNotFoundError(scope, self.registry.scope)
+            child = Container(
+                *child.child_registries,
+                parent_container=child,
+                context=context,
+                lock_factory=lock_factory,
+                close_parent=True,
+                lock_per_key=lock_per_key,
+                eager_executor=self.eager_executor,
+            )
         return ContextWrapper(child)
 
     @overload
@@ -155,23 +250,209 @@ class Container:
             dependency_type: Any,
             component: Component | None = DEFAULT_COMPONENT,
     ) -> Any:
+        key = self.registry.keys.get(dependency_type, component)
+        solved = self._get_cached(key)
+        if solved is not MISSING:
+            return solved
+        owner = self.registry.owners.get(key)
+        if owner is not None:
+            # objects of parent scopes are locked only by their container
+            return self._get_from_owner(key, owner)
         lock = self.lock
-        key = DependencyKey(dependency_type, component)
         if not lock:
             return self._get_unlocked(key)
         with lock:
+            # cache is checked again, so object is created only once
             return self._get_unlocked(key)
 
+    def get_many(self, dependencies: Iterable[Any]) -> tuple[Any, ...]:
+        """
+        Get several dependencies at once.
+
+        :param dependencies: type hints or `DependencyKey` instances
+            for non-default components
+        :return: tuple of resolved objects in the same order
+        """
+        from_dependency = self.registry.keys.from_dependency
+        keys = [from_dependency(dependency) for dependency in dependencies]
+        lock = self.lock
+        if not lock:
+            return tuple([self._get_unlocked(key) for key in keys])
+        with lock:
+            return tuple([self._get_unlocked(key) for key in keys])
+
+    def warm_up(
+            self,
+            dependencies: Iterable[Any] | None = None,
+            max_workers: int | None = None,
+    ) -> None:
+        """
+        Create cached dependencies of this scope concurrently in threads.
+
+        Dependencies are created in order of the graph, so finalizers are
+        called in the correct order on close. Other threads using this
+        container wait until warm up is finished.
+
+        :param dependencies: type hints or `DependencyKey` instances,
+            all cached dependencies of the scope by default
+        :param max_workers: max number of threads
+        """
+        registry = self.registry
+        if dependencies is None:
+            keys = list(registry.factories)
+        else:
+            from_dependency = registry.keys.from_dependency
+            keys = [from_dependency(dependency) for dependency in dependencies]
+        graph = self._warm_up_graph(keys)
+        lock = self.lock
+        if not lock:
+            resolve_graph_in_threads(self._get_unlocked, graph, max_workers)
+            return
+        with lock:
+            resolve_graph_in_threads(self._get_unlocked, graph, max_workers)
+
+    def _warm_up_graph(
+            self, keys: Iterable[DependencyKey],
+    ) -> dict[DependencyKey, set[DependencyKey]]:
+        # all cached dependencies of this scope are included,
+        # so no object can be created by two threads at once
+        graph: dict[DependencyKey, set[DependencyKey]] = {}
+        # generic factories are specialized while searching, as it is
+        # done on compilation
+        with self.registry.compile_lock:
+            stack = [key for key in keys if self._is_warmed_up(key)]
+            while stack:
+                key = stack.pop()
+                if key in graph:
+                    continue
+                graph[key] = self._cached_dependencies(key)
+                stack.extend(graph[key])
+        return graph
+
+    def _is_warmed_up(self, key: DependencyKey) -> bool:
+        factory = self.registry.get_factory(key)
+        return (
+            factory is not None
+            and factory.cache
+            and factory.type in SYNC_TYPES
+            and not get_type_vars(key.type_hint)
+        )
+
+    def _cached_dependencies(self, key: DependencyKey) -> set[DependencyKey]:
+        # objects which are not cached are created by their dependants,
+        # so their dependencies are dependencies of those dependants
+        get_factory = self.registry.get_factory
+        result = set()
+        visited = set()
+        stack = [key]
+        while stack:
+            factory = cast(Factory, get_factory(stack.pop()))
+            for dep in (
+                *factory.dependencies,
+                *factory.kw_dependencies.values(),
+            ):
+                if dep in visited:
+                    continue
+                visited.add(dep)
+                dep_factory = get_factory(dep)
+                if dep_factory is None:
+                    continue
+                if self._is_warmed_up(dep):
+                    result.add(dep)
+                elif dep_factory.type is not FactoryType.CONTEXT:
+                    stack.append(dep)
+        return result
+
+    def freeze(self) -> None:
+        """
+        Make container read-only.
+
+        Objects created before are returned without locking using a
+        single dict lookup. Creating new objects in this container raises
+        `FrozenContainerError`, dependencies of parent scopes are still
+        requested from parent containers.
+        """
+        frozen = dict(self._context)
+        cache = self._cache
+        for key, slot in self.registry.slots.items():
+            if slot < len(cache) and cache[slot] is not MISSING:
+                frozen[key] = cache[slot]
+        self._frozen = frozen
+
+    def _get_cached(self, key: DependencyKey) -> Any:
+        # Created objects are never replaced, so they can be read
+        # without lock. MISSING is returned if object is not created yet
+        frozen = self._frozen
+        if frozen is not None:
+            return frozen.get(key, MISSING)
+        slot = self.registry.slots.get(key)
+        if slot is None:
+            return self._get_context(key)
+        cache = self._cache
+        if slot < len(cache):
+            return cache[slot]
+        return MISSING
+
+    def _get_context(self, key: DependencyKey) -> Any:
+        # container is not stored in its context to avoid reference cycle
+        if key == CONTAINER_KEY:
+            return self
+        return self._context.get(key, MISSING)
+
     def _get_unlocked(self, key: DependencyKey) -> Any:
-        if key in self._cache:
-            return self._cache[key]
-        compiled = self.registry.get_compiled(key)
+        registry = self.registry
+        cache = self._cache
+        slot = registry.slots.get(key)
+        if slot is None:
+            solved = self._get_context(key)
+            if solved is not MISSING:
+                return solved
+            if key in registry.owners:
+                return self._get_from_owner(key, registry.owners[key])
+        # slot can be added after container creation
+        elif slot < len(cache) and (solved := cache[slot]) is not MISSING:
+            return solved
+        compiled = registry.get_compiled(key)
         if not compiled:
-            if not self.parent_container:
-                raise NoFactoryError(key)
-            return self.parent_container.get(
-                key.type_hint, key.component,
+            return self._get_from_parent(key)
+        if self._frozen is not None:
+            raise FrozenContainerError(key, registry.scope)
+        if len(cache) < len(registry.slots):
+            cache.extend([MISSING] * (len(registry.slots) - len(cache)))
+        key_locks = self._key_locks
+        # Not cached objects are created on each request, so they are not
+        # locked even if they have a slot. Factories for `type[T]` are not
+        # stored in registry and are not cached as well
+        if (
+            key_locks is not None
+            and (factory := registry.factories.get(key)) is not None
+            and factory.cache
+        ):
+            return self._create_locked(key, compiled, key_locks)
+        return self._create(key, compiled)
+
+    def _create_locked(
+            self,
+            key: DependencyKey,
+            compiled: CompiledFactory,
+            key_locks: dict[DependencyKey, AbstractContextManager[Any]],
+    ) -> Any:
+        # Dependencies are locked while the lock of dependant is held.
+        # Graph is acyclic, so all threads take locks in the same order
+        lock = key_locks.get(key)
+        if lock is None:
+            lock_factory = cast(
+                Callable[[], AbstractContextManager[Any]], self._lock_factory,
             )
+            lock = key_locks.setdefault(key, lock_factory())
+        with lock:
+            # it could be created while waiting for the lock
+            solved = self._cache[self.registry.slots[key]]
+            if solved is not MISSING:
+                return solved
+            return self._create(key, compiled)
+
+    def _create(self, key: DependencyKey, compiled: CompiledFactory) -> Any:
         try:
             return compiled(self._get_unlocked, self._exits, self._cache)
         except NoFactoryError as e:
@@ -181,18 +462,111 @@ class Container:
             # If None is returned, then go to the parent container
             e.add_path(cast(Factory, self.registry.get_factory(key)))
             raise
+        finally:
+            # finalizers are added by compiled factories
+            if self.registry.leak_tracker is not None:
+                self._report_finalizers()
+
+    def _report_finalizers(self) -> None:
+        tracker = cast(LeakTracker, self.registry.leak_tracker)
+        if self._exits:
+            tracker.set_finalizers(self, len(self._exits))
+
+    def _get_from_parent(self, key: DependencyKey) -> Any:
+        if not self.parent_container:
+            raise NoFactoryError(key)
+        return self.parent_container.get(key.type_hint, key.component)
+
+    def _get_from_owner(self, key: DependencyKey, scope: BaseScope) -> Any:
+        # parent containers without factory for the key are skipped,
+        # only context passed to them can contain it
+        container = self.parent_container
+        while container is not None and (
+            container.registry.scope is not scope
+            and key not in container._context  # noqa: SLF001
+        ):
+            container = container.parent_container
+        if container is None:
+            # container of collapsed scope is not created
+            raise NoContextValueError(key.type_hint)
+        solved = container._get_cached(key)  # noqa: SLF001
+        if solved is not MISSING:
+            return solved
+        lock = container.lock
+        if not lock:
+            return container._get_unlocked(key)  # noqa: SLF001
+        with lock:
+            return container._get_unlocked(key)  # noqa: SLF001
+
+    def _create_eager(self) -> None:
+        # containers of skipped scopes are entered together with this one
+        if self.close_parent and self.parent_container:
+            self.parent_container._create_eager()  # noqa: SLF001
+        if self.registry.eager_groups:
+            resolve_in_threads(
+                self._get_unlocked,
+                self._cache,
+                self.registry.eager_groups,
+                self.eager_executor,
+            )
+
+    def _reuse(
+            self,
+            parent_container: Container,
+            context: dict[Any, Any] | None,
+            lock_factory: Callable[[], AbstractContextManager[Any]] | None,
+            *,
+            lock_per_key: bool,
+    ) -> None:
+        # containers of skipped scopes are reused together with this one
+        container = self
+        while True:
+            container._init_locks(  # noqa: SLF001
+                lock_factory, lock_per_key=lock_per_key,
+            )
+            container.eager_executor = parent_container.eager_executor
+            if context:
+                container._set_context(context)  # noqa: SLF001
+            if container.registry.leak_tracker is not None:
+                container.registry.leak_tracker.track(container)
+            if not container.close_parent:
+                break
+            container = cast(Container, container.parent_container)
+        container.parent_container = parent_container
+
+    def _set_context(self, context: dict[Any, Any]) -> None:
+        self._context = self.registry.make_context(context)
+        self.registry.fill_cache(self._cache, self._context)
+
+    def _release(self) -> None:
+        # Drop context of closed container, so it is not kept in pool.
+        # Other cells of cache are already empty
+        container = self
+        while True:
+            slots = container.registry.slots
+            cache = container._cache  # noqa: SLF001
+            for key in container._context:  # noqa: SLF001
+                slot = slots.get(key)
+                if slot is not None:
+                    cache[slot] = MISSING
+            container._context = EMPTY_CONTEXT  # noqa: SLF001
+            if not container.close_parent:
+                break
+            container = cast(Container, container.parent_container)
 
     def close(self, exception: BaseException | None = None) -> None:
-        errors = []
-        for exit_generator in self._exits[::-1]:
-            try:
-                if exit_generator.type is FactoryType.GENERATOR:
-                    exit_generator.callable.send(exception)  # type: ignore[attr-defined]
-            except StopIteration:  # noqa: PERF203
-                pass
-            except Exception as err:  # noqa: BLE001
-                errors.append(err)
-        self._cache = {**self._context}
+        self._frozen = None
+        errors: list[Exception] = []
+        exits = self._exits
+        if exits:
+            errors = finalize_sync(
+                exits, exception, self.registry.finalization,
+            )
+            # cache and exits are reset in place, so container can be reused
+            exits.clear()
+        self.registry.reset_cache(self._cache, self._context)
+        if self.registry.leak_tracker is not None:
+            self.registry.leak_tracker.untrack(self)
         if self.close_parent and self.parent_container:
             try:
                 self.parent_container.close(exception)
@@ -204,12 +578,22 @@ class Container:
 
 
 class ContextWrapper:
-    __slots__ = ("container",)
+    __slots__ = ("container", "pool")
 
-    def __init__(self, container: Container):
+    def __init__(
+            self,
+            container: Container,
+            pool: ContainerPool[ContextWrapper] | None = None,
+    ):
         self.container = container
+        self.pool = pool
 
     def __enter__(self) -> Container:
+        try:
+            self.container._create_eager()  # noqa: SLF001
+        except BaseException as e:
+            self.container.close(e)
+            raise
         return self.container
 
     def __exit__(
@@ -219,6 +603,9 @@ class ContextWrapper:
         exc_tb: TracebackType | None = None,
     ) -> None:
         self.container.close(exception=exc_val)
+        if self.pool is not None:
+            self.container._release()  # noqa: SLF001
+            self.pool.release(self)
 
 
 def make_container(
@@ -229,27 +616,72 @@ def make_container(
         skip_validation: bool = False,
         start_scope: BaseScope | None = None,
         validation_settings: ValidationSettings = DEFAULT_VALIDATION,
+        finalization_settings: FinalizationSettings = DEFAULT_FINALIZATION,
+        inline_compilation: bool = False,
+        compile_eagerly: bool = False,
+        specializations: Sequence[Any] = (),
+        lock_per_key: bool = False,
+        lock_policy: LockPolicy | None = None,
+        free_threaded: bool = False,
+        eager_executor: Executor | None = None,
+        pool_size: int = 0,
+        leak_tracker: LeakTracker | None = None,
 ) -> Container:
+    if (
+        finalization_settings.concurrent
+        or finalization_settings.timeout is not None
+    ):
+        raise ValueError(  # noqa: TRY003
+            "Sync container does not support `concurrent` and `timeout` "
+            "of finalization settings: sync finalizers cannot be "
+            "cancelled and are called one by one in the current thread",
+        )
+    if free_threaded:
+        if inline_compilation:
+            raise ValueError(  # noqa: TRY003
+                "Free-threaded container cannot be used with inline "
+                "compilation, as it requires locking per key. "
+                "Pass either `free_threaded=True` "
+                "or `inline_compilation=True`",
+            )
+        # threads must not wait for compilation or for each other
+        compile_eagerly = True
+        lock_per_key = True
     registries = RegistryBuilder(
         scopes=scopes,
         container_key=CONTAINER_KEY,
         providers=providers,
         skip_validation=skip_validation,
         validation_settings=validation_settings,
+        finalization=finalization_settings,
+        inline_compilation=inline_compilation,
+        specializations=specializations,
+        lock_policy=lock_policy,
+        # only async container uses them
+        find_sync_subgraphs=False,
+        pool_size=pool_size,
+        leak_tracker=leak_tracker,
     ).build()
+    if compile_eagerly:
+        for registry in registries:
+            registry.compile_all(is_async=False)
     container = Container(
         *registries,
         context=context,
         lock_factory=lock_factory,
+        lock_per_key=lock_per_key,
+        eager_executor=eager_executor,
     )
     if start_scope is None:
         while container.registry.scope.skip:
             container = Container(
-                *container.child_registries,
+                *skip_collapsed(container.child_registries),
                 parent_container=container,
                 context=context,
                 lock_factory=lock_factory,
                 close_parent=True,
+                lock_per_key=lock_per_key,
+                eager_executor=eager_executor,
             )
     else:
         while container.registry.scope is not start_scope:
@@ -259,6 +691,8 @@ def make_container(
                 context=context,
                 lock_factory=lock_factory,
                 close_parent=True,
+                lock_per_key=lock_per_key,
+                eager_executor=eager_executor,
             )
     return container
 
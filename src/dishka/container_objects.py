@@ -1,15 +1,27 @@
 from abc import abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Any, Protocol
+from types import MappingProxyType
+from typing import Any, Final, Generic, Protocol, TypeVar
 
 from dishka.entities.factory_type import FactoryType
+from dishka.entities.key import DependencyKey
+
+# marks empty cells of container cache
+MISSING: Final = object()
+# context of containers entered without it, never changed
+EMPTY_CONTEXT: Final[Mapping[DependencyKey, Any]] = MappingProxyType({})
+
+T = TypeVar("T")
 
 
 @dataclass(slots=True)
 class Exit:
     type: FactoryType
     callable: Callable[..., Any]
+    run_in_thread: bool | Executor = False
+    provides: DependencyKey | None = None
 
 
 class CompiledFactory(Protocol):
@@ -17,7 +29,49 @@ class CompiledFactory(Protocol):
     def __call__(
             self,
             getter: Callable[..., Any],
-            exits: list[Exit],
-            context: Any,
+            # None if there are no generator factories in registry
+            exits: list[Exit] | None,
+            cache: list[Any],
+    ) -> Any:
+        raise NotImplementedError
+
+
+class CompiledAsyncFactory(Protocol):
+    @abstractmethod
+    async def __call__(
+            self,
+            getter: Callable[..., Any],
+            # None if there are no generator factories in registry
+            exits: list[Exit] | None,
+            cache: list[Any],
+            sync_getter: Callable[..., Any],
     ) -> Any:
         raise NotImplementedError
+
+
+class ContainerPool(Generic[T]):
+    """
+    Closed child containers which can be entered again.
+
+    Items are taken and returned by different threads, so only atomic
+    operations of list are used.
+    """
+
+    __slots__ = ("_items", "size")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._items: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def acquire(self) -> T | None:
+        try:
+            return self._items.pop()
+        except IndexError:
+            return None
+
+    def release(self, item: T) -> None:
+        if len(self._items) < self.size:
+            self._items.append(item)
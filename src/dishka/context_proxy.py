@@ -1,14 +1,20 @@
+from __future__ import annotations
+
 from collections.abc import Iterator, MutableMapping
-from typing import Any, NoReturn
+from typing import TYPE_CHECKING, Any, NoReturn
 
+from .container_objects import MISSING
 from .entities.key import DependencyKey
 
+if TYPE_CHECKING:
+    from .registry import Registry
+
 
 class ContextProxy(MutableMapping[DependencyKey, Any]):
     def __init__(
             self,
-            context: dict[DependencyKey, Any],
-            cache: dict[DependencyKey, Any],
+            context: MutableMapping[DependencyKey, Any],
+            cache: MutableMapping[DependencyKey, Any],
     ) -> None:
         self._cache = cache
         self._context = context
@@ -30,3 +36,56 @@ class ContextProxy(MutableMapping[DependencyKey, Any]):
 
     def __iter__(self) -> Iterator[DependencyKey]:
         return iter(self._cache)
+
+
+class CacheView(MutableMapping[DependencyKey, Any]):
+    """
+    Mapping over container cache stored in slots.
+
+    Keys which are unknown to registry are stored only in context.
+    """
+
+    def __init__(
+            self,
+            registry: Registry,
+            cache: list[Any],
+            context: MutableMapping[DependencyKey, Any],
+    ) -> None:
+        self._registry = registry
+        self._cache = cache
+        self._context = context
+
+    def __setitem__(self, key: DependencyKey, value: Any) -> None:
+        slot = self._registry.slots.get(key)
+        if slot is None:
+            self._context[key] = value
+            return
+        if slot >= len(self._cache):
+            missing = slot + 1 - len(self._cache)
+            self._cache.extend([MISSING] * missing)
+        self._cache[slot] = value
+
+    def __delitem__(self, key: DependencyKey) -> NoReturn:
+        raise RuntimeError(  # noqa: TRY003
+            "Cannot delete anything from cache",
+        )
+
+    def __getitem__(self, key: DependencyKey) -> Any:
+        slot = self._registry.slots.get(key)
+        if slot is None:
+            return self._context[key]
+        if slot >= len(self._cache) or self._cache[slot] is MISSING:
+            raise KeyError(key)
+        return self._cache[slot]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[DependencyKey]:
+        cache = self._cache
+        for key, slot in self._registry.slots.items():
+            if slot < len(cache) and cache[slot] is not MISSING:
+                yield key
+        for key in self._context:
+            if key not in self._registry.slots:
+                yield key
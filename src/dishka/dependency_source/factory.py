@@ -4,6 +4,7 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
+from concurrent.futures import Executor
 from typing import Any
 
 from dishka.entities.component import Component
@@ -15,10 +16,13 @@ from dishka.entities.scope import BaseScope
 class Factory(FactoryData):
     __slots__ = (
         "cache",
+        "concurrent",
         "dependencies",
+        "eager",
         "is_to_bind",
         "kw_dependencies",
         "override",
+        "run_in_thread",
     )
 
     def __init__(
@@ -33,6 +37,9 @@ class Factory(FactoryData):
             is_to_bind: bool,
             cache: bool,
             override: bool,
+            concurrent: bool = False,
+            run_in_thread: bool | Executor = False,
+            eager: bool = False,
     ) -> None:
         super().__init__(
             source=source,
@@ -45,6 +52,9 @@ class Factory(FactoryData):
         self.is_to_bind = is_to_bind
         self.cache = cache
         self.override = override
+        self.concurrent = concurrent
+        self.run_in_thread = run_in_thread
+        self.eager = eager
 
     def __get__(self, instance: Any, owner: Any) -> Factory:
         scope = self.scope or instance.scope
@@ -66,6 +76,9 @@ class Factory(FactoryData):
             is_to_bind=False,
             cache=self.cache,
             override=self.override,
+            concurrent=self.concurrent,
+            run_in_thread=self.run_in_thread,
+            eager=self.eager,
         )
 
     def with_component(self, component: Component) -> Factory:
@@ -84,4 +97,7 @@ class Factory(FactoryData):
             cache=self.cache,
             type_=self.type,
             override=self.override,
+            concurrent=self.concurrent,
+            run_in_thread=self.run_in_thread,
+            eager=self.eager,
         )
@@ -0,0 +1,20 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .key import DependencyKey
+
+
+@dataclass
+class FinalizationSettings:
+    # finalize dependencies which do not depend on each other
+    # concurrently, not supported by sync container
+    concurrent: bool = False
+    # seconds to wait for each finalizer, not supported by sync container
+    timeout: float | None = None
+    # finalizers running at least this number of seconds are reported
+    slow_threshold: float | None = None
+    # called with dependency key and duration of slow finalizer
+    on_slow: Callable[[DependencyKey, float], None] | None = None
+
+
+DEFAULT_FINALIZATION = FinalizationSettings()
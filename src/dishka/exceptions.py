@@ -123,6 +123,35 @@ class ChildScopeNotFoundError(ValueError, DishkaError):
         )
 
 
+class FinalizerTimeoutError(TimeoutError, DishkaError):
+    def __init__(
+            self, requested: DependencyKey | None, timeout: float | None,
+    ) -> None:
+        self.requested = requested
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        if self.requested is None:
+            name = "dependency"
+        else:
+            name = get_name(self.requested.type_hint, include_module=False)
+        return f"Finalizer of {name} did not finish in {self.timeout}s"
+
+
+class FrozenContainerError(DishkaError):
+    def __init__(self, requested: DependencyKey, scope: BaseScope) -> None:
+        self.requested = requested
+        self.scope = scope
+
+    def __str__(self) -> str:
+        name = get_name(self.requested.type_hint, include_module=False)
+        return (
+            f"Cannot create ({name}, "
+            f"component={self.requested.component!r}): "
+            f"container of {self.scope} is frozen"
+        )
+
+
 class UnknownScopeError(InvalidGraphError):
     def __init__(
             self,
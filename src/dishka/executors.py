@@ -0,0 +1,52 @@
+"""
+Run sync factories in threads for async container
+
+Factories marked with `run_in_thread` are called in an executor, so
+blocking code does not stop the event loop. The same is done with
+finalization of their generators.
+"""
+from asyncio import get_running_loop
+from collections.abc import Callable, Generator
+from concurrent.futures import Executor
+from contextlib import suppress
+from contextvars import copy_context
+from functools import partial
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def get_executor(run_in_thread: bool | Executor) -> Executor | None:
+    """Return executor or `None` for default one of the event loop."""
+    if isinstance(run_in_thread, Executor):
+        return run_in_thread
+    return None
+
+
+async def call_in_thread(
+        run_in_thread: bool | Executor,
+        func: Callable[..., T],
+        /,
+        *args: Any,
+        **kwargs: Any,
+) -> T:
+    loop = get_running_loop()
+    # context is copied as `asyncio.to_thread` does
+    call = partial(copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(run_in_thread), call)
+
+
+def start_generator(generator: Generator[T, Any, Any]) -> T:
+    # StopIteration cannot be passed through a future
+    try:
+        return next(generator)
+    except StopIteration:
+        raise RuntimeError("generator didn't yield") from None  # noqa: TRY003
+
+
+def finish_generator(
+        generator: Generator[Any, Any, Any],
+        exception: BaseException | None,
+) -> None:
+    with suppress(StopIteration):
+        generator.send(exception)
@@ -4,7 +4,10 @@ Compile call of factory acctording to its type
 For each template we expect global variables:
 * source - factory.source
 * factory_type - factory.type
+* run_in_thread - factory.run_in_thread
 * provides - factory.provides
+* slot - index of factory.provides in container cache
+* missing - marker of empty cache cell
 * Exit
 * NoContextValueError
 * UnsupportedFactoryError
@@ -15,19 +18,62 @@ When formatting substituted:
 * args - "getter(arg1), getter(arg2)..." or async version
 * kwargs - "arg1=getter(arg1), arg2=getter(arg2)..." or async version
 * cache - expression to save cache
+* params - additional parameters: ", sync_getter" for async container
+* prepare - statement run before resolving dependencies
+
+In async container `sync_getter` is used instead of `await getter`
+for dependencies which can be created without any awaits.
+
+Dependencies of the same scope are read from cache by their slot
+and getter is called only if they are not created yet.
+
+Sync factories with `run_in_thread` are called using `call_in_thread`
+in async container.
+
+If dependencies can be resolved concurrently, they are created in
+advance by `resolve_concurrently` (global), which fills the cache.
 """
 import linecache
+from collections.abc import Collection, Mapping, Sequence
 from typing import cast
 
 from dishka.entities.factory_type import FactoryType
-from .container_objects import CompiledFactory, Exit
+from .concurrent_resolution import resolve_concurrently
+from .container_objects import MISSING, CompiledFactory, Exit
 from .dependency_source import Factory
+from .entities.key import DependencyKey
 from .exceptions import NoContextValueError, UnsupportedFactoryError
+from .executors import call_in_thread, start_generator
+
+
+def make_getter(
+        arg: str,
+        sync_args: Collection[str],
+        arg_slots: Mapping[str, int],
+) -> str:
+    if arg in sync_args:
+        getter = f"sync_getter({arg})"
+    else:
+        getter = f"{{await}}getter({arg})"
+    if arg not in arg_slots:
+        return getter
+    slot = arg_slots[arg]
+    return (
+        f"(_dishka_dep if (_dishka_dep := cache[{slot}]) is not missing "
+        f"else {getter})"
+    )
 
 
-def make_args(args: list[str], kwargs: list[str]) -> str:
+def make_args(
+        args: list[str],
+        kwargs: list[str],
+        sync_args: Collection[str] = (),
+        arg_slots: Mapping[str, int] | None = None,
+) -> str:
+    if arg_slots is None:
+        arg_slots = {}
     res = ", ".join(
-        f"{{await}}getter({arg})"
+        make_getter(arg, sync_args, arg_slots)
         for arg in args
     )
     if not kwargs:
@@ -35,56 +81,76 @@ def make_args(args: list[str], kwargs: list[str]) -> str:
     if res:
         res += ", "
     res += ", ".join(
-        f"{arg}={{await}}getter({arg})"
+        f"{arg}={make_getter(arg, sync_args, arg_slots)}"
         for arg in kwargs
     )
     return res
 
 
 GENERATOR = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
+    {prepare}
     generator = source({args})
     solved = next(generator)
-    exits.append(Exit(factory_type, generator))
+    exits.append(Exit(factory_type, generator, provides=provides))
     {cache}
     return solved
 """
 ASYNC_GENERATOR = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
+    {prepare}
     generator = source({args})
     solved = await anext(generator)
-    exits.append(Exit(factory_type, generator))
+    exits.append(Exit(factory_type, generator, provides=provides))
     {cache}
     return solved
 """
 FACTORY = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
+    {prepare}
     solved = source({args})
     {cache}
     return solved
 """
 ASYNC_FACTORY = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
+    {prepare}
     solved = await source({args})
     {cache}
     return solved
 """
+GENERATOR_IN_THREAD = """
+{async}def get(getter, exits, cache{params}):
+    {prepare}
+    generator = source({args})
+    solved = await call_in_thread(run_in_thread, start_generator, generator)
+    exits.append(Exit(factory_type, generator, run_in_thread, provides))
+    {cache}
+    return solved
+"""
+FACTORY_IN_THREAD = """
+{async}def get(getter, exits, cache{params}):
+    {prepare}
+    solved = await call_in_thread(run_in_thread, source, {args})
+    {cache}
+    return solved
+"""
 VALUE = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
     return source
 """
 ALIAS = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
     solved = {args}
     {cache}
     return solved
 """
 CONTEXT = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
     raise NoContextValueError(provides.type_hint)
 """
 INVALID = """
-{async}def get(getter, exits, context):
+{async}def get(getter, exits, cache{params}):
     raise UnsupportedFactoryError(
         f"Unsupported factory type {{factory_type}}.",
     )
@@ -99,6 +165,10 @@ ASYNC_BODIES = {
     FactoryType.CONTEXT: CONTEXT,
     FactoryType.ALIAS: ALIAS,
 }
+THREAD_BODIES = {
+    FactoryType.FACTORY: FACTORY_IN_THREAD,
+    FactoryType.GENERATOR: GENERATOR_IN_THREAD,
+}
 SYNC_BODIES = {
     FactoryType.FACTORY: FACTORY,
     FactoryType.GENERATOR: GENERATOR,
@@ -107,45 +177,98 @@ SYNC_BODIES = {
     FactoryType.ALIAS: ALIAS,
 }
 
-CACHE = "context[provides] = solved"
+CACHE = "cache[slot] = solved"
+PREPARE_CONCURRENT = (
+    "await resolve_concurrently(getter, cache, concurrent_groups)"
+)
+
 
+def _find_sync_args(
+        args: Mapping[str, DependencyKey],
+        sync_dependencies: Collection[DependencyKey],
+) -> set[str]:
+    return {
+        name
+        for name, dependency in args.items()
+        if dependency in sync_dependencies
+    }
 
-def compile_factory(*, factory: Factory, is_async: bool) -> CompiledFactory:
+
+def compile_factory(
+        *,
+        factory: Factory,
+        is_async: bool,
+        sync_dependencies: Collection[DependencyKey] = (),
+        slots: Mapping[DependencyKey, int] | None = None,
+        concurrent_groups: Sequence[Sequence[DependencyKey]] = (),
+) -> CompiledFactory:
+    if slots is None:
+        slots = {}
     args = {
         f"_dishka_arg{i}": dep
         for i, dep in enumerate(factory.dependencies)
     }
     kwargs = factory.kw_dependencies
+    arg_slots = {
+        name: slots[dep]
+        for name, dep in (*args.items(), *kwargs.items())
+        if dep in slots
+    }
 
     if is_async:
         async_ = "async "
         await_ = "await "
-        body_template = ASYNC_BODIES.get(factory.type, INVALID)
+        params = ", sync_getter"
+        if factory.run_in_thread and factory.type in THREAD_BODIES:
+            body_template = THREAD_BODIES[factory.type]
+        else:
+            body_template = ASYNC_BODIES.get(factory.type, INVALID)
+        sync_args = _find_sync_args(args, sync_dependencies)
+        sync_args.update(_find_sync_args(kwargs, sync_dependencies))
+        prepare = PREPARE_CONCURRENT if concurrent_groups else ""
     else:
         async_ = ""
         await_ = ""
+        params = ""
         body_template = SYNC_BODIES.get(factory.type, INVALID)
-    if factory.cache:
+        sync_args = set()
+        prepare = ""
+    slot = slots.get(factory.provides)
+    if factory.cache and slot is not None:
         cache = CACHE
     else:
         cache = ""
 
-    args_str = make_args(list(args), list(kwargs)).format_map({
+    args_str = make_args(
+        list(args), list(kwargs), sync_args, arg_slots,
+    ).format_map({
         "await": await_,
     })
     body = body_template.format_map({
         "async": async_,
         "await": await_,
+        "params": params,
         "args": args_str,
         "cache": cache,
+        "prepare": prepare,
     })
     func_globals = {
         "source": factory.source,
         "provides": factory.provides,
         "factory_type": factory.type,
+        "slot": slot,
+        "missing": MISSING,
         "Exit": Exit,
         "NoContextValueError": NoContextValueError,
         "UnsupportedFactoryError": UnsupportedFactoryError,
+        "resolve_concurrently": resolve_concurrently,
+        "run_in_thread": factory.run_in_thread,
+        "call_in_thread": call_in_thread,
+        "start_generator": start_generator,
+        "concurrent_groups": tuple(
+            tuple((key, slots[key]) for key in group)
+            for group in concurrent_groups
+        ),
         **args,
         **kwargs,
     }
@@ -0,0 +1,136 @@
+"""
+Call finalizers of dependencies when container is closed
+
+By default finalizers are called one by one in reverse order of
+creation. Async container can call them concurrently: finalizer of each
+dependency waits only for finalizers of objects created later which
+depend on it within the same scope.
+"""
+import asyncio
+from asyncio import Event, gather, wait_for
+from collections.abc import Mapping, Sequence
+from time import perf_counter
+
+from .container_objects import Exit
+from .dependency_source import Factory
+from .entities.factory_type import FactoryType
+from .entities.finalization_settings import FinalizationSettings
+from .entities.key import DependencyKey
+from .exceptions import FinalizerTimeoutError
+from .executors import call_in_thread, finish_generator
+
+
+def _report_slow(
+        exit_: Exit, settings: FinalizationSettings, started: float,
+) -> None:
+    if settings.on_slow is None or settings.slow_threshold is None:
+        return
+    duration = perf_counter() - started
+    if duration >= settings.slow_threshold and exit_.provides is not None:
+        settings.on_slow(exit_.provides, duration)
+
+
+def finalize_sync(
+        exits: Sequence[Exit],
+        exception: BaseException | None,
+        settings: FinalizationSettings,
+) -> list[Exception]:
+    errors: list[Exception] = []
+    for exit_ in reversed(exits):
+        started = perf_counter()
+        try:
+            if exit_.type is FactoryType.GENERATOR:
+                exit_.callable.send(exception)  # type: ignore[attr-defined]
+        except StopIteration:
+            pass
+        except Exception as err:  # noqa: BLE001
+            errors.append(err)
+        _report_slow(exit_, settings, started)
+    return errors
+
+
+async def _finish(exit_: Exit, exception: BaseException | None) -> None:
+    try:
+        if exit_.type is FactoryType.ASYNC_GENERATOR:
+            await exit_.callable.asend(exception)  # type: ignore[attr-defined]
+        elif exit_.run_in_thread:
+            await call_in_thread(
+                exit_.run_in_thread,
+                finish_generator,
+                exit_.callable,
+                exception,
+            )
+        elif exit_.type is FactoryType.GENERATOR:
+            exit_.callable.send(exception)  # type: ignore[attr-defined]
+    except (StopIteration, StopAsyncIteration):
+        pass
+
+
+async def _finalize_one(
+        exit_: Exit,
+        exception: BaseException | None,
+        settings: FinalizationSettings,
+        errors: list[Exception],
+) -> None:
+    started = perf_counter()
+    try:
+        if settings.timeout is None:
+            await _finish(exit_, exception)
+        else:
+            await wait_for(_finish(exit_, exception), settings.timeout)
+    except asyncio.TimeoutError:
+        errors.append(FinalizerTimeoutError(exit_.provides, settings.timeout))
+    except Exception as err:  # noqa: BLE001
+        errors.append(err)
+    _report_slow(exit_, settings, started)
+
+
+def _dependencies(
+        key: DependencyKey | None, factories: Mapping[DependencyKey, Factory],
+) -> set[DependencyKey]:
+    result: set[DependencyKey] = set()
+    stack = [] if key is None else [key]
+    while stack:
+        factory = factories.get(stack.pop())
+        if factory is None:
+            continue
+        for dep in (*factory.dependencies, *factory.kw_dependencies.values()):
+            if dep not in result:
+                result.add(dep)
+                stack.append(dep)
+    return result
+
+
+async def finalize(
+        exits: Sequence[Exit],
+        exception: BaseException | None,
+        settings: FinalizationSettings,
+        factories: Mapping[DependencyKey, Factory],
+) -> list[Exception]:
+    errors: list[Exception] = []
+    if not settings.concurrent:
+        for exit_ in reversed(exits):
+            await _finalize_one(exit_, exception, settings, errors)
+        return errors
+
+    dependencies = [_dependencies(e.provides, factories) for e in exits]
+    finished = [Event() for _ in exits]
+
+    def must_wait(index: int, dependant: int) -> bool:
+        key = exits[index].provides
+        if key is None or exits[dependant].provides is None:
+            return True
+        return key in dependencies[dependant]
+
+    async def finalize_ordered(index: int) -> None:
+        # dependants are always created after their dependencies
+        for dependant in range(index + 1, len(exits)):
+            if must_wait(index, dependant):
+                await finished[dependant].wait()
+        try:
+            await _finalize_one(exits[index], exception, settings, errors)
+        finally:
+            finished[index].set()
+
+    await gather(*(finalize_ordered(index) for index in range(len(exits))))
+    return errors
@@ -0,0 +1,407 @@
+"""
+Compile resolution of a dependency together with its subgraph
+
+Unlike `factory_compiler`, which generates one function per factory,
+here a single function is generated per requested key. All dependencies
+provided by the same registry are created inline: cache is checked in
+place and sources are called directly. Only dependencies of other
+scopes are requested using `getter`. Dependencies which can be resolved
+concurrently are created in advance by `resolve_concurrently`.
+
+Code is generated without nesting, each dependency is emitted once.
+First, cache is read for all dependencies starting from the requested
+one, so it is known which of them should be created. Then objects are
+created in topological order, dependencies first.
+
+Generated function has the same signature as in `factory_compiler`,
+so it can be used by containers without any changes.
+"""
+from __future__ import annotations
+
+import linecache
+from collections.abc import Callable, Collection, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from dishka.entities.factory_type import FactoryType
+from .concurrent_resolution import resolve_concurrently
+from .container_objects import MISSING, CompiledFactory, Exit
+from .dependency_source import Factory
+from .entities.key import DependencyKey
+from .exceptions import (
+    NoContextValueError,
+    NoFactoryError,
+    UnsupportedFactoryError,
+)
+from .executors import call_in_thread, start_generator
+
+FactoryGetter = Callable[[DependencyKey], Factory | None]
+ConcurrentGroups = Sequence[Sequence[DependencyKey]]
+
+ASYNC_TYPES = (FactoryType.ASYNC_FACTORY, FactoryType.ASYNC_GENERATOR)
+
+
+def _add_path(error: NoFactoryError, path: Sequence[Factory]) -> None:
+    for factory in reversed(path):
+        error.add_path(factory)
+
+
+@dataclass(eq=False, slots=True)
+class _Node:
+    """Factory inlined into generated function."""
+
+    factory: Factory
+    # name of variable with created object
+    var: str
+    slot: int | None
+    # factories from the requested one, used to report missing ones
+    path: list[Factory]
+    deps: list[_Node | DependencyKey] = field(default_factory=list)
+    kw_deps: dict[str, _Node | DependencyKey] = field(default_factory=dict)
+    dependants: list[_Node] = field(default_factory=list)
+    # python expression, object is created if it is true
+    condition: str | None = None
+
+
+class _GraphCompiler:
+    def __init__(
+            self,
+            get_factory: FactoryGetter,
+            slots: Mapping[DependencyKey, int],
+            sync_dependencies: Collection[DependencyKey],
+            concurrent_groups: Mapping[DependencyKey, ConcurrentGroups],
+            *,
+            is_async: bool,
+    ):
+        self.get_factory = get_factory
+        self.slots = slots
+        self.sync_dependencies = sync_dependencies
+        self.concurrent_groups = concurrent_groups
+        self.is_async = is_async
+        self.await_ = "await " if is_async else ""
+        self.lines: list[str] = []
+        self.globals: dict[str, Any] = {
+            "Exit": Exit,
+            "NoContextValueError": NoContextValueError,
+            "NoFactoryError": NoFactoryError,
+            "UnsupportedFactoryError": UnsupportedFactoryError,
+            "add_path": _add_path,
+            "missing": MISSING,
+            "resolve_concurrently": resolve_concurrently,
+            "call_in_thread": call_in_thread,
+            "start_generator": start_generator,
+        }
+        self.counter = 0
+        # inlined cached dependencies
+        self.nodes: dict[DependencyKey, _Node] = {}
+        # inlined factories, dependencies go first
+        self.order: list[_Node] = []
+        # keys of factories being added, they are requested via getter
+        self.stack: set[DependencyKey] = set()
+
+    def _name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _global(self, prefix: str, value: Any) -> str:
+        name = self._name(prefix)
+        self.globals[name] = value
+        return name
+
+    def _emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def _emit_getter(
+            self, key: DependencyKey, indent: int, path: list[Factory],
+    ) -> str:
+        var = self._name("dep")
+        key_name = self._global("key", key)
+        if self.is_async and key in self.sync_dependencies:
+            call = f"sync_getter({key_name})"
+        else:
+            call = f"{self.await_}getter({key_name})"
+        # path[0] is added by container itself
+        inlined_path = path[1:]
+        if not inlined_path:
+            self._emit(indent, f"{var} = {call}")
+            return var
+        path_name = self._global("path", tuple(inlined_path))
+        self._emit(indent, "try:")
+        self._emit(indent + 1, f"{var} = {call}")
+        self._emit(indent, "except NoFactoryError as e:")
+        self._emit(indent + 1, f"add_path(e, {path_name})")
+        self._emit(indent + 1, "raise")
+        return var
+
+    def _add_dependency(
+            self, key: DependencyKey, dependant: _Node,
+    ) -> _Node | DependencyKey:
+        """Find node of dependency or return key to request it via getter."""
+        if self.is_async and key in self.sync_dependencies:
+            # synchronous subgraphs are created only by container
+            # as it can be guarded against other threads
+            return key
+        node = self.nodes.get(key)
+        if node is None:
+            if key in self.stack:
+                return key
+            factory = self.get_factory(key)
+            # slot is checked after factory search as it can specialize
+            # generic
+            slot = self.slots.get(key)
+            if factory is None or slot is None:
+                return key
+            node = self._add_node(
+                factory, self._name("dep"), slot, dependant.path,
+            )
+            # not cached objects are created for each dependant
+            if factory.cache or factory.type is FactoryType.CONTEXT:
+                self.nodes[key] = node
+        node.dependants.append(dependant)
+        return node
+
+    def _add_node(
+            self,
+            factory: Factory,
+            var: str,
+            slot: int | None,
+            path: list[Factory],
+    ) -> _Node:
+        node = _Node(factory, var, slot, [*path, factory])
+        factory_type = factory.type
+        if factory_type is not FactoryType.CONTEXT and (
+            self.is_async or factory_type not in ASYNC_TYPES
+        ):
+            self.stack.add(factory.provides)
+            node.deps = [
+                self._add_dependency(dep, node)
+                for dep in factory.dependencies
+            ]
+            node.kw_deps = {
+                name: self._add_dependency(dep, node)
+                for name, dep in factory.kw_dependencies.items()
+            }
+            self.stack.discard(factory.provides)
+        # dependencies are added first, so the order is topological
+        self.order.append(node)
+        return node
+
+    def _emit_condition(self, node: _Node) -> None:
+        """
+        Read cache and decide if object should be created.
+
+        Object is needed if any of its dependants is created, so
+        dependants must be processed first.
+        """
+        self._emit(1, f"{node.var} = cache[{node.slot}]")
+        conditions = []
+        for dependant in dict.fromkeys(node.dependants):
+            if dependant.condition is None:
+                # dependant is always created
+                node.condition = f"{node.var} is missing"
+                return
+            conditions.append(dependant.condition)
+        need = self._name("need")
+        self._emit(1, f"{need} = {' or '.join(conditions)}")
+        node.condition = f"{need} and {node.var} is missing"
+
+    def _emit_concurrent(self, node: _Node) -> None:
+        groups = self.concurrent_groups.get(node.factory.provides)
+        if not groups or not self.is_async:
+            return
+        groups_name = self._global("groups", tuple(
+            tuple((key, self.slots[key]) for key in group)
+            for group in groups
+        ))
+        indent = 1
+        if node.condition is not None:
+            self._emit(indent, f"if {node.condition}:")
+            indent += 1
+        self._emit(
+            indent,
+            f"await resolve_concurrently(getter, cache, {groups_name})",
+        )
+
+    def _thread_option(self, factory: Factory) -> str | None:
+        if not self.is_async or not factory.run_in_thread:
+            return None
+        return self._global("run_in_thread", factory.run_in_thread)
+
+    def _emit_sync_call(
+            self,
+            factory: Factory,
+            var: str,
+            indent: int,
+            source: str,
+            args_str: str,
+    ) -> None:
+        option = self._thread_option(factory)
+        if option:
+            self._emit(
+                indent,
+                f"{var} = await call_in_thread("
+                f"{option}, {source}, {args_str})",
+            )
+        else:
+            self._emit(indent, f"{var} = {source}({args_str})")
+
+    def _emit_generator(
+            self,
+            factory: Factory,
+            var: str,
+            indent: int,
+            source: str,
+            args_str: str,
+    ) -> None:
+        generator = self._name("generator")
+        type_name = self._global("factory_type", factory.type)
+        key_name = self._global("key", factory.provides)
+        option = self._thread_option(factory)
+        self._emit(indent, f"{generator} = {source}({args_str})")
+        if option:
+            self._emit(
+                indent,
+                f"{var} = await call_in_thread("
+                f"{option}, start_generator, {generator})",
+            )
+        else:
+            self._emit(indent, f"{var} = next({generator})")
+            option = "False"
+        self._emit(
+            indent,
+            f"exits.append(Exit({type_name}, {generator}, "
+            f"{option}, {key_name}))",
+        )
+
+    def _emit_arg(
+            self,
+            dep: _Node | DependencyKey,
+            indent: int,
+            path: list[Factory],
+    ) -> str:
+        if isinstance(dep, _Node):
+            return dep.var
+        return self._emit_getter(dep, indent, path)
+
+    def _emit_node(self, node: _Node) -> None:
+        if node.condition is None:
+            self._emit_factory(node, 1)
+        else:
+            self._emit(1, f"if {node.condition}:")
+            self._emit_factory(node, 2)
+
+    def _emit_factory(self, node: _Node, indent: int) -> None:
+        factory = node.factory
+        var = node.var
+        factory_type = factory.type
+        if factory_type is FactoryType.CONTEXT:
+            key_name = self._global("key", factory.provides)
+            self._emit(
+                indent, f"raise NoContextValueError({key_name}.type_hint)",
+            )
+            return
+        if factory_type in ASYNC_TYPES and not self.is_async:
+            type_name = self._global("factory_type", factory_type)
+            self._emit(indent, "raise UnsupportedFactoryError(")
+            self._emit(
+                indent + 1, f'f"Unsupported factory type {{{type_name}}}.",',
+            )
+            self._emit(indent, ")")
+            return
+
+        args = [self._emit_arg(dep, indent, node.path) for dep in node.deps]
+        args.extend(
+            f"{name}={self._emit_arg(dep, indent, node.path)}"
+            for name, dep in node.kw_deps.items()
+        )
+        args_str = ", ".join(args)
+        source = self._global("source", factory.source)
+
+        if factory_type is FactoryType.FACTORY:
+            self._emit_sync_call(factory, var, indent, source, args_str)
+        elif factory_type is FactoryType.ASYNC_FACTORY:
+            self._emit(indent, f"{var} = await {source}({args_str})")
+        elif factory_type is FactoryType.GENERATOR:
+            self._emit_generator(factory, var, indent, source, args_str)
+        elif factory_type is FactoryType.ASYNC_GENERATOR:
+            generator = self._name("generator")
+            type_name = self._global("factory_type", factory_type)
+            key_name = self._global("key", factory.provides)
+            self._emit(indent, f"{generator} = {source}({args_str})")
+            self._emit(indent, f"{var} = await anext({generator})")
+            self._emit(
+                indent,
+                f"exits.append(Exit({type_name}, {generator}, "
+                f"provides={key_name}))",
+            )
+        elif factory_type is FactoryType.VALUE:
+            self._emit(indent, f"{var} = {source}")
+        elif factory_type is FactoryType.ALIAS:
+            self._emit(indent, f"{var} = {args_str}")
+
+        if factory.cache and node.slot is not None:
+            self._emit(indent, f"cache[{node.slot}] = {var}")
+
+    def compile(self, factory: Factory) -> CompiledFactory:
+        if self.is_async:
+            self._emit(
+                0, "async def get(getter, exits, cache, sync_getter):",
+            )
+        else:
+            self._emit(0, "def get(getter, exits, cache):")
+        # requested object is not cached, so it is always created
+        root = self._add_node(
+            factory, "solved", self.slots.get(factory.provides), [],
+        )
+        # each dependency is checked once, dependants go first
+        for node in reversed(self.order):
+            if node is not root:
+                self._emit_condition(node)
+            self._emit_concurrent(node)
+        for node in self.order:
+            self._emit_node(node)
+        self._emit(1, "return solved")
+        body = "\n".join(self.lines) + "\n"
+
+        source_file_name = f"__dishka_graph_{id(factory)}"
+        if self.is_async:
+            source_file_name += "_async"
+        lines = body.splitlines(keepends=True)
+        linecache.cache[source_file_name] = (
+            len(body), None, lines, source_file_name,
+        )
+        compiled = compile(body, source_file_name, "exec")
+        exec(compiled, self.globals)  # noqa: S102
+        # typing.cast is called because globals["get"] is not typed
+        return cast(CompiledFactory, self.globals["get"])
+
+
+def compile_graph(
+        *,
+        factory: Factory,
+        get_factory: FactoryGetter,
+        slots: Mapping[DependencyKey, int],
+        is_async: bool,
+        sync_dependencies: Collection[DependencyKey] = (),
+        concurrent_groups: Mapping[DependencyKey, ConcurrentGroups] = {},
+) -> CompiledFactory:
+    """
+    Compile factory inlining all dependencies available via `get_factory`.
+
+    :param factory: factory of requested dependency
+    :param get_factory: function to find factories of the same scope
+    :param slots: indices of dependencies in container cache
+    :param is_async: generate coroutine function for async container
+    :param sync_dependencies: keys which can be requested without await
+    :param concurrent_groups: dependencies resolved concurrently
+        for each factory
+    :return: compiled function
+    """
+    compiler = _GraphCompiler(
+        get_factory,
+        slots,
+        sync_dependencies,
+        concurrent_groups,
+        is_async=is_async,
+    )
+    return compiler.compile(factory)
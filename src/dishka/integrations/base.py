@@ -1,3 +1,4 @@
+import linecache
 from collections.abc import Awaitable, Callable, Sequence
 from inspect import (
     Parameter,
@@ -137,25 +138,13 @@ def wrap_injection(
         for param in additional_params:
             new_annotations[param.name] = param.annotation
 
-    if is_async:
-        auto_injected_func = _async_injection_wrapper(
-            # typing.cast is needed because the function must be async
-            func=cast(Callable[P, Awaitable[T]],func),
-            dependencies=dependencies,
-            additional_params=additional_params,
-            container_getter=cast(
-                ContainerGetter[AsyncContainer], container_getter,
-            ),
-        )
-    else:
-        auto_injected_func = _sync_injection_wrapper(
-            func=func,
-            dependencies=dependencies,
-            additional_params=additional_params,
-            container_getter=cast(
-                ContainerGetter[Container], container_getter,
-            ),
-        )
+    auto_injected_func = _compile_injection_wrapper(
+        func=func,
+        dependencies=dependencies,
+        additional_params=additional_params,
+        container_getter=container_getter,
+        is_async=is_async,
+    )
 
     auto_injected_func.__dishka_injected__ = True  # type: ignore[attr-defined]
     auto_injected_func.__name__ = func.__name__
@@ -174,69 +163,101 @@ def is_dishka_injected(func: Callable[..., Any]) -> bool:
     return hasattr(func, "__dishka_injected__")
 
 
-def _async_injection_wrapper(
-        container_getter: ContainerGetter[AsyncContainer],
+SYNC_WRAPPER = """
+def auto_injected_func(*args, **kwargs):
+    container = container_getter(args, kwargs)
+{pop}{solve}    return func(*args, **kwargs{solved})
+"""
+
+GENERATOR_WRAPPER = """
+def auto_injected_func(*args, **kwargs):
+    container = container_getter(args, kwargs)
+{pop}{solve}    yield from func(*args, **kwargs{solved})
+"""
+
+ASYNC_WRAPPER = """
+async def auto_injected_func(*args, **kwargs):
+    container = container_getter(args, kwargs)
+{pop}{solve}    return await func(*args, **kwargs{solved})
+"""
+
+ASYNC_GENERATOR_WRAPPER = """
+async def auto_injected_func(*args, **kwargs):
+    container = container_getter(args, kwargs)
+{pop}{solve}    async for message in func(*args, **kwargs{solved}):
+        yield message
+"""
+
+
+def _compile_injection_wrapper(
+        container_getter: ContainerGetter[Container | AsyncContainer],
         additional_params: Sequence[Parameter],
         dependencies: dict[str, DependencyKey],
-        func: Callable[P, Awaitable[T]],
-) -> Callable[P, Awaitable[T]]:
-    if isasyncgenfunction(func):
-        async def auto_injected_func(*args: P.args, **kwargs: P.kwargs) -> T:
-            container = container_getter(args, kwargs)
-            for param in additional_params:
-                kwargs.pop(param.name)
-            solved = {
-                name: await container.get(
-                    dep.type_hint, component=dep.component,
-                )
-                for name, dep in dependencies.items()
-            }
-            async for message in func(*args, **kwargs, **solved):
-                yield message
+        func: Callable[P, Any],
+        *,
+        is_async: bool,
+) -> Callable[P, Any]:
+    """
+    Generate wrapper resolving dependencies and calling `func`.
+
+    Wrapper keeps `*args, **kwargs` as container getters expect
+    arguments in the form they are passed by the framework.
+    Additional params are removed and dependencies are passed
+    as keyword arguments without any loops.
+    """
+    if is_async and isasyncgenfunction(func):
+        template = ASYNC_GENERATOR_WRAPPER
+    elif is_async:
+        template = ASYNC_WRAPPER
+    elif isgeneratorfunction(func):
+        template = GENERATOR_WRAPPER
     else:
-        async def auto_injected_func(*args: P.args, **kwargs: P.kwargs) -> T:
-            container = container_getter(args, kwargs)
-            for param in additional_params:
-                kwargs.pop(param.name)
-            solved = {
-                name: await container.get(
-                    dep.type_hint, component=dep.component,
-                )
-                for name, dep in dependencies.items()
-            }
-            return await func(*args, **kwargs, **solved)
-
-    return auto_injected_func
-
-
-def _sync_injection_wrapper(
-        container_getter: ContainerGetter[Container],
-        additional_params: Sequence[Parameter],
-        dependencies: dict[str, DependencyKey],
-        func: Callable[P, T],
-) -> Callable[P, T]:
-    if isgeneratorfunction(func):
-        def auto_injected_func(*args: P.args, **kwargs: P.kwargs) -> T:
-            container = container_getter(args, kwargs)
-            for param in additional_params:
-                kwargs.pop(param.name)
-            solved = {
-                name: container.get(dep.type_hint, component=dep.component)
-                for name, dep in dependencies.items()
-            }
-            yield from func(*args, **kwargs, **solved)
+        template = SYNC_WRAPPER
+
+    pop = "".join(
+        f"    kwargs.pop({param.name!r})\n"
+        for param in additional_params
+    )
+    variables = [f"dep{i}" for i in range(len(dependencies))]
+    if variables:
+        await_ = "await " if is_async else ""
+        # containers implemented outside of dishka may have no `get_many`
+        get_each = "".join(
+            f"        {variable} = {await_}container.get("
+            f"hint{i}, component=component{i})\n"
+            for i, variable in enumerate(variables)
+        )
+        solve = (
+            '    get_many = getattr(container, "get_many", None)\n'
+            "    if get_many is None:\n"
+            f"{get_each}"
+            "    else:\n"
+            f"        {', '.join(variables)}, = {await_}get_many(keys)\n"
+        )
     else:
-        def auto_injected_func(*args: P.args, **kwargs: P.kwargs) -> T:
-            container = container_getter(args, kwargs)
-            for param in additional_params:
-                kwargs.pop(param.name)
-            solved = {
-                name: container.get(dep.type_hint, component=dep.component)
-                for name, dep in dependencies.items()
-            }
-            return func(*args, **kwargs, **solved)
-
-    return auto_injected_func
+        solve = ""
+    solved = "".join(
+        f", {name}={variable}"
+        for name, variable in zip(dependencies, variables, strict=True)
+    )
+    body = template.format(pop=pop, solve=solve, solved=solved)
+
+    source_file_name = f"__dishka_injection_{id(func)}"
+    lines = body.splitlines(keepends=True)
+    linecache.cache[source_file_name] = (
+        len(body), None, lines, source_file_name,
+    )
+    global_ns = {
+        "container_getter": container_getter,
+        "func": func,
+        "keys": tuple(dependencies.values()),
+    }
+    for i, key in enumerate(dependencies.values()):
+        global_ns[f"hint{i}"] = key.type_hint
+        global_ns[f"component{i}"] = key.component
+    exec(compile(body, source_file_name, "exec"), global_ns)  # noqa: S102
+    # typing.cast is called because generated function is not typed
+    return cast(Callable[P, Any], global_ns["auto_injected_func"])
 
 
 def _add_params(
@@ -0,0 +1,93 @@
+"""
+Canonical dependency keys shared by registries of one container
+
+Resolving a dependency requires hashing its key, and hash of a key is
+computed from its type hint each time. For generic aliases from
+`typing` it is done in python code walking all the type arguments.
+Dict lookups with the same key object also skip comparing keys.
+
+So each key is interned once, when registries are built, and the same
+object is used by factories and by `container.get`. Requested type hint
+is matched by identity, so no key is created while resolving.
+"""
+from types import FunctionType
+from typing import Any
+
+from .entities.component import DEFAULT_COMPONENT, Component
+from .entities.key import DependencyKey
+
+# hashes of canonical keys by their ids. Tuples cannot have attributes
+# without `__dict__`, so they are stored here until key table is deleted
+_HASHES: dict[int, int] = {}
+
+
+class _HashedKey(DependencyKey):
+    """Key which stores hash for type hints hashed in python code."""
+
+    __slots__ = ()
+
+    def __hash__(self) -> int:
+        key_hash = _HASHES.get(id(self))
+        if key_hash is None:
+            # key table is already deleted
+            return tuple.__hash__(self)
+        return key_hash
+
+    def __repr__(self) -> str:
+        return repr(DependencyKey(self.type_hint, self.component))
+
+
+class KeyTable:
+    __slots__ = ("_by_id", "_canonical", "_hashed")
+
+    def __init__(self) -> None:
+        # ids of created `_HashedKey` objects
+        self._hashed: list[int] = []
+        self._canonical: dict[DependencyKey, DependencyKey] = {}
+        # type hint is stored to prevent its id from being reused
+        self._by_id: dict[
+            tuple[int, Component | None], tuple[Any, DependencyKey],
+        ] = {}
+
+    def intern(self, key: DependencyKey) -> DependencyKey:
+        """Return canonical object equal to provided key."""
+        id_key = (id(key.type_hint), key.component)
+        found = self._by_id.get(id_key)
+        if found is not None:
+            return found[1]
+        canonical = self._canonical.get(key)
+        if canonical is None:
+            canonical = self._make_canonical(key)
+            self._canonical[canonical] = canonical
+        self._by_id[id_key] = (key.type_hint, canonical)
+        return canonical
+
+    def _make_canonical(self, key: DependencyKey) -> DependencyKey:
+        if not isinstance(type(key.type_hint).__hash__, FunctionType):
+            return DependencyKey(key.type_hint, key.component)
+        hashed_key = _HashedKey(key.type_hint, key.component)
+        _HASHES[id(hashed_key)] = tuple.__hash__(hashed_key)
+        self._hashed.append(id(hashed_key))
+        return hashed_key
+
+    def __del__(self) -> None:
+        # keys are referenced by the table, so their ids are not reused yet
+        for key_id in self._hashed:
+            _HASHES.pop(key_id, None)
+
+    def get(
+            self, type_hint: Any, component: Component | None,
+    ) -> DependencyKey:
+        """Find canonical key without creating a new one if possible."""
+        found = self._by_id.get((id(type_hint), component))
+        if found is not None:
+            return found[1]
+        # equal type hint can be created again, e.g. `list[int]`
+        key = DependencyKey(type_hint, component)
+        return self._canonical.get(key, key)
+
+    def from_dependency(self, dependency: Any) -> DependencyKey:
+        """Find key for a type hint of default component or another key."""
+        if isinstance(dependency, DependencyKey):
+            return self.get(dependency.type_hint, dependency.component)
+        return self.get(dependency, DEFAULT_COMPONENT)
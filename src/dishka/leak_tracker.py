@@ -0,0 +1,165 @@
+"""
+Track containers which are entered but not closed
+
+Tracker keeps a record for each open container: its scope, time of
+creation and the line of code which has created it. When a container
+with not called finalizers is garbage collected without being closed,
+the leak is reported using `ResourceWarning` or a custom callback.
+
+Containers are not referenced by the tracker, so it does not prevent
+them from being collected. The same is true for their finalizers, as
+generators can reference the container: containers report the number
+of not called finalizers each time they create an object.
+"""
+import inspect
+import warnings
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import RLock
+from time import monotonic
+from traceback import FrameSummary
+from typing import Any
+
+from .entities.scope import BaseScope
+
+# frames of these modules are skipped when searching for call site
+_INTERNAL_MODULES = frozenset({
+    "dishka.async_container",
+    "dishka.container",
+    "dishka.leak_tracker",
+})
+
+
+@dataclass(slots=True)
+class TrackedContainer:
+    scope: BaseScope
+    # value of `time.monotonic()` when container was entered
+    created_at: float
+    call_site: FrameSummary | None
+    is_open: bool = True
+    # number of not called finalizers
+    finalizers: int = 0
+
+    @property
+    def age(self) -> float:
+        return monotonic() - self.created_at
+
+
+@dataclass(slots=True)
+class ScopeStats:
+    count: int
+    oldest_age: float
+    oldest_call_site: FrameSummary | None
+
+
+def _find_call_site() -> FrameSummary | None:
+    frame = inspect.currentframe()
+    while (
+        frame is not None
+        and frame.f_globals.get("__name__") in _INTERNAL_MODULES
+    ):
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return FrameSummary(
+        frame.f_code.co_filename,
+        frame.f_lineno,
+        frame.f_code.co_name,
+        lookup_line=False,
+    )
+
+
+class LeakTracker:
+    def __init__(
+            self,
+            *,
+            capture_call_site: bool = True,
+            on_leak: Callable[[TrackedContainer, int], None] | None = None,
+    ) -> None:
+        """
+        :param capture_call_site: find the line which has created
+            each container, it takes time proportional to stack depth
+        :param on_leak: called with record of collected container
+            and number of its not called finalizers instead of warning
+        """
+        self.capture_call_site = capture_call_site
+        self.on_leak = on_leak
+        # finalizers of collected containers can be called at any moment
+        self._lock = RLock()
+        # records of alive containers by their ids
+        self._records: dict[int, TrackedContainer] = {}
+
+    def track(self, container: Any) -> None:
+        """Register container which is entered."""
+        call_site = _find_call_site() if self.capture_call_site else None
+        key = id(container)
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                # closed container is entered again
+                record.created_at = monotonic()
+                record.call_site = call_site
+                record.is_open = True
+                record.finalizers = 0
+                return
+            self._records[key] = TrackedContainer(
+                scope=container.scope,
+                created_at=monotonic(),
+                call_site=call_site,
+            )
+        finalizer = weakref.finalize(container, self._collected, key)
+        # containers alive at interpreter exit are not reported
+        finalizer.atexit = False
+
+    def set_finalizers(self, container: Any, count: int) -> None:
+        """Update number of not called finalizers of container."""
+        with self._lock:
+            record = self._records.get(id(container))
+            if record is not None:
+                record.finalizers = count
+
+    def untrack(self, container: Any) -> None:
+        """Mark container as closed."""
+        with self._lock:
+            record = self._records.get(id(container))
+            if record is not None:
+                record.is_open = False
+
+    def _collected(self, key: int) -> None:
+        with self._lock:
+            record = self._records.pop(key, None)
+        if record is None or not record.is_open or not record.finalizers:
+            return
+        if self.on_leak is not None:
+            self.on_leak(record, record.finalizers)
+            return
+        warnings.warn(
+            f"Container of scope {record.scope} created at "
+            f"{record.call_site} was not closed, "
+            f"{record.finalizers} finalizers were not called",
+            ResourceWarning,
+            # called by garbage collector, there is no useful caller
+            stacklevel=1,
+        )
+
+    def open_containers(self) -> list[TrackedContainer]:
+        """Records of open containers, the oldest first."""
+        with self._lock:
+            records = [r for r in self._records.values() if r.is_open]
+        return sorted(records, key=lambda r: r.created_at)
+
+    def stats(self) -> dict[BaseScope, ScopeStats]:
+        """Number of open containers and the oldest of them per scope."""
+        result: dict[BaseScope, ScopeStats] = {}
+        for record in self.open_containers():
+            stats = result.get(record.scope)
+            if stats is None:
+                result[record.scope] = ScopeStats(
+                    count=1,
+                    oldest_age=record.age,
+                    oldest_call_site=record.call_site,
+                )
+            else:
+                stats.count += 1
+        return result
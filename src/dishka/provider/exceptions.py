@@ -141,3 +141,13 @@ class IndependentDecoratorError(ValueError, DishkaError):
             f"Decorator {name} does not depends on provided type.\n"
             f"Did you mean @provide instead of @decorate?"
         )
+
+
+class InvalidFactoryOptionsError(ValueError, DishkaError):
+    def __init__(self, source: Any, reason: str) -> None:
+        self.source = source
+        self.reason = reason
+
+    def __str__(self) -> str:
+        name = get_name(self.source, include_module=True)
+        return f"Invalid options of factory `{name}`.\n{self.reason}"
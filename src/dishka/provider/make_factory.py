@@ -10,6 +10,7 @@ from collections.abc import (
     Iterator,
     Sequence,
 )
+from concurrent.futures import Executor
 from inspect import (
     Parameter,
     isasyncgenfunction,
@@ -60,6 +61,7 @@ from dishka.entities.provides_marker import ProvideMultiple
 from dishka.entities.scope import BaseScope
 from dishka.text_rendering import get_name
 from .exceptions import (
+    InvalidFactoryOptionsError,
     MissingHintsError,
     MissingReturnHintError,
     NotAFactoryError,
@@ -205,6 +207,9 @@ def _make_factory_by_class(
         source: type,
         cache: bool,
         override: bool,
+        concurrent: bool,
+        run_in_thread: bool | Executor,
+        eager: bool,
 ) -> Factory:
     if not provides:
         provides = source
@@ -241,6 +246,9 @@ def _make_factory_by_class(
         is_to_bind=False,
         cache=cache,
         override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 def _check_self_name(
@@ -269,6 +277,9 @@ def _make_factory_by_function(
         is_in_class: bool,
         override: bool,
         check_self_name: bool,
+        concurrent: bool,
+        run_in_thread: bool | Executor,
+        eager: bool,
 ) -> Factory:
     # typing.cast is applied as unwrap takes a Callable object
     raw_source = unwrap(cast(Callable[..., Any], source))
@@ -318,6 +329,9 @@ def _make_factory_by_function(
         is_to_bind=is_in_class,
         cache=cache,
         override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 
@@ -328,6 +342,9 @@ def _make_factory_by_static_method(
         source: staticmethod,  # type: ignore[type-arg]
         cache: bool,
         override: bool,
+        concurrent: bool,
+        run_in_thread: bool | Executor,
+        eager: bool,
 ) -> Factory:
     if missing_hints := _params_without_hints(source, skip_self=False):
         raise MissingHintsError(source, missing_hints)
@@ -365,6 +382,9 @@ def _make_factory_by_static_method(
         is_to_bind=False,
         cache=cache,
         override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 
@@ -375,6 +395,9 @@ def _make_factory_by_other_callable(
         source: Callable[..., Any],
         cache: bool,
         override: bool,
+        concurrent: bool,
+        run_in_thread: bool | Executor,
+        eager: bool,
 ) -> Factory:
     if _is_bound_method(source):
         to_check = source.__func__  # type: ignore[attr-defined]
@@ -395,6 +418,9 @@ def _make_factory_by_other_callable(
         is_in_class=is_in_class,
         override=override,
         check_self_name=False,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
     if factory.is_to_bind:
         dependencies = factory.dependencies[1:]  # remove `self`
@@ -410,9 +436,29 @@ def _make_factory_by_other_callable(
         is_to_bind=False,
         cache=cache,
         override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 
+def _check_options(factory: Factory) -> None:
+    if factory.eager and not factory.cache:
+        raise InvalidFactoryOptionsError(
+            factory.source,
+            "Eager dependency must be cached, "
+            "otherwise it is created again on each request.",
+        )
+    if factory.run_in_thread and factory.type in (
+        FactoryType.ASYNC_FACTORY, FactoryType.ASYNC_GENERATOR,
+    ):
+        raise InvalidFactoryOptionsError(
+            factory.source,
+            "Async factory cannot be run in thread, "
+            "remove `run_in_thread` option.",
+        )
+
+
 def make_factory(
         *,
         provides: Any,
@@ -421,6 +467,36 @@ def make_factory(
         cache: bool,
         is_in_class: bool,
         override: bool,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
+) -> Factory:
+    factory = _make_factory(
+        provides=provides,
+        scope=scope,
+        source=source,
+        cache=cache,
+        is_in_class=is_in_class,
+        override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
+    )
+    _check_options(factory)
+    return factory
+
+
+def _make_factory(
+        *,
+        provides: Any,
+        scope: BaseScope | None,
+        source: ProvideSource,
+        cache: bool,
+        is_in_class: bool,
+        override: bool,
+        concurrent: bool,
+        run_in_thread: bool | Executor,
+        eager: bool,
 ) -> Factory:
     if get_origin(source) is ProvideMultiple:
         if provides is None:
@@ -437,6 +513,9 @@ def make_factory(
             source=cast(type, source),
             cache=cache,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
     elif isfunction(source) or isinstance(source, classmethod):
         return _make_factory_by_function(
@@ -447,6 +526,9 @@ def make_factory(
             is_in_class=is_in_class,
             override=override,
             check_self_name=True,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
     elif isbuiltin(source):
         return _make_factory_by_function(
@@ -457,6 +539,9 @@ def make_factory(
             is_in_class=False,
             override=override,
             check_self_name=False,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
     elif isinstance(source, staticmethod):
         return _make_factory_by_static_method(
@@ -465,6 +550,9 @@ def make_factory(
             source=source,
             cache=cache,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
     elif callable(source):
         return _make_factory_by_other_callable(
@@ -473,6 +561,9 @@ def make_factory(
             source=source,
             cache=cache,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
     else:
         raise NotAFactoryError(type(source))
@@ -487,6 +578,9 @@ def _provide(
         is_in_class: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     composite = ensure_composite(source)
     factory = make_factory(
@@ -494,6 +588,9 @@ def _provide(
         source=composite.origin, cache=cache,
         is_in_class=is_in_class,
         override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
     composite.dependency_sources.extend(unpack_factory(factory))
     if not recursive:
@@ -511,6 +608,9 @@ def _provide(
                 cache=cache,
                 is_in_class=is_in_class,
                 override=override,
+                concurrent=concurrent,
+                run_in_thread=run_in_thread,
+                eager=eager,
             )
             composite.dependency_sources.extend(additional.dependency_sources)
     return composite
@@ -524,11 +624,17 @@ def provide_on_instance(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     return _provide(
         provides=provides, scope=scope, source=source, cache=cache,
         is_in_class=False,
         recursive=recursive, override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 
@@ -540,6 +646,9 @@ def provide(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> Callable[[Callable[..., Any]], CompositeDependencySource]:
     ...
 
@@ -553,6 +662,9 @@ def provide(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     ...
 
@@ -565,6 +677,9 @@ def provide(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource | Callable[
     [Callable[..., Any]], CompositeDependencySource,
 ]:
@@ -588,18 +703,30 @@ def provide(
     :param cache: save created object to scope cache or not
     :param recursive: register dependencies as factories as well
     :param override: dependency override
+    :param concurrent: resolve independent dependencies concurrently
+        in async container
+    :param run_in_thread: call sync factory in a thread when used with
+        async container: `True` for default executor of event loop
+        or an `Executor` instance
+    :param eager: create dependency when its scope is entered
     :return: instance of Factory or a decorator returning it
     """
     if source is not None:
         return _provide(
             provides=provides, scope=scope, source=source, cache=cache,
             is_in_class=True, recursive=recursive, override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
 
     def scoped(func: Callable[..., Any]) -> CompositeDependencySource:
         return _provide(
             provides=provides, scope=scope, source=func, cache=cache,
             is_in_class=True, recursive=recursive, override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
 
     return scoped
@@ -613,6 +740,9 @@ def _provide_all(
         is_in_class: bool,
         recursive: bool,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     composite = CompositeDependencySource(None)
     for single_provides in provides:
@@ -624,6 +754,9 @@ def _provide_all(
             is_in_class=is_in_class,
             recursive=recursive,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
         composite.dependency_sources.extend(source.dependency_sources)
     return composite
@@ -635,11 +768,17 @@ def provide_all(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     return _provide_all(
         provides=provides, scope=scope,
         cache=cache, is_in_class=True,
         recursive=recursive, override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
 
 
@@ -649,9 +788,15 @@ def provide_all_on_instance(
         cache: bool = True,
         recursive: bool = False,
         override: bool = False,
+        concurrent: bool = False,
+        run_in_thread: bool | Executor = False,
+        eager: bool = False,
 ) -> CompositeDependencySource:
     return _provide_all(
         provides=provides, scope=scope,
         cache=cache, is_in_class=False,
         recursive=recursive, override=override,
+        concurrent=concurrent,
+        run_in_thread=run_in_thread,
+        eager=eager,
     )
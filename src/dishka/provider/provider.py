@@ -1,5 +1,6 @@
 import inspect
 from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
 from typing import Any, TypeGuard
 
 from dishka.dependency_source import (
@@ -129,6 +130,9 @@ class Provider(BaseProvider):
             cache: bool = True,
             recursive: bool = False,
             override: bool = False,
+            concurrent: bool = False,
+            run_in_thread: bool | Executor = False,
+            eager: bool = False,
     ) -> CompositeDependencySource:
         if scope is None:
             scope = self.scope
@@ -139,6 +143,9 @@ class Provider(BaseProvider):
             cache=cache,
             recursive=recursive,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
         self._add_dependency_sources(str(source), composite.dependency_sources)
         return composite
@@ -150,6 +157,9 @@ class Provider(BaseProvider):
             cache: bool = True,
             recursive: bool = False,
             override: bool = False,
+            concurrent: bool = False,
+            run_in_thread: bool | Executor = False,
+            eager: bool = False,
     ) -> CompositeDependencySource:
         if scope is None:
             scope = self.scope
@@ -159,6 +169,9 @@ class Provider(BaseProvider):
             cache=cache,
             recursive=recursive,
             override=override,
+            concurrent=concurrent,
+            run_in_thread=run_in_thread,
+            eager=eager,
         )
         self._add_dependency_sources("?", composite.dependency_sources)
         return composite
@@ -36,6 +36,9 @@ def unpack_factory(factory: Factory) -> Sequence[DependencySource]:
             is_to_bind=factory.is_to_bind,
             cache=factory.cache,
             override=factory.override,
+            concurrent=factory.concurrent,
+            run_in_thread=factory.run_in_thread,
+            eager=factory.eager,
             provides=DependencyKey(
                 provides_first,
                 factory.provides.component,
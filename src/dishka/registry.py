@@ -1,8 +1,15 @@
-from collections.abc import Callable
-from typing import Any, TypeVar, get_args, get_origin
+from collections.abc import Callable, Mapping
+from threading import Lock
+from typing import Any, TypeVar, cast, get_args, get_origin
 
 from ._adaptix.type_tools.fundamentals import get_type_vars
-from .container_objects import CompiledFactory
+from .container_objects import (
+    EMPTY_CONTEXT,
+    MISSING,
+    CompiledAsyncFactory,
+    CompiledFactory,
+    ContainerPool,
+)
 from .dependency_source import (
     Factory,
 )
@@ -11,35 +18,173 @@ from .dependency_source.type_match import (
     is_broader_or_same_type,
 )
 from .entities.factory_type import FactoryType
+from .entities.finalization_settings import (
+    DEFAULT_FINALIZATION,
+    FinalizationSettings,
+)
 from .entities.key import DependencyKey
 from .entities.scope import BaseScope
 from .factory_compiler import compile_factory
+from .graph_compiler import compile_graph
+from .key_table import KeyTable
+from .leak_tracker import LeakTracker
+
+# lock factory of containers for each listed scope
+LockPolicy = Mapping[BaseScope, Callable[[], Any] | None]
 
 
 class Registry:
     __slots__ = (
+        "collapsed",
+        "compile_lock",
         "compiled",
         "compiled_async",
+        "concurrent_groups",
+        "eager_groups",
         "factories",
+        "finalization",
         "has_fallback",
+        "has_finalizers",
+        "inline_compilation",
+        "keys",
+        "leak_tracker",
+        "lock_policy",
+        "owners",
+        "pool",
         "scope",
+        "slots",
+        "sync_subgraphs",
     )
 
-    def __init__(self, scope: BaseScope, *, has_fallback: bool) -> None:
+    def __init__(
+            self,
+            scope: BaseScope,
+            *,
+            has_fallback: bool,
+            inline_compilation: bool = False,
+            keys: KeyTable | None = None,
+            lock_policy: LockPolicy | None = None,
+            finalization: FinalizationSettings = DEFAULT_FINALIZATION,
+            pool_size: int = 0,
+            leak_tracker: LeakTracker | None = None,
+    ) -> None:
         self.scope = scope
+        self.leak_tracker = leak_tracker
+        # shared by all registries, overrides lock factory of containers
+        self.lock_policy: LockPolicy = lock_policy or {}
+        self.finalization = finalization
+        # canonical keys, shared by all registries of a container
+        self.keys = KeyTable() if keys is None else keys
         self.factories: dict[DependencyKey, Factory] = {}
+        # index of each dependency in cache of container
+        self.slots: dict[DependencyKey, int] = {}
         self.compiled: dict[DependencyKey, Callable[..., Any]] = {}
         self.compiled_async: dict[DependencyKey, Callable[..., Any]] = {}
+        # compilation can add specialized factories and their slots,
+        # so it is not done concurrently even for unlocked containers
+        self.compile_lock = Lock()
         self.has_fallback = has_fallback
+        # containers of registry without generator factories have no exits
+        self.has_finalizers = False
+        self.inline_compilation = inline_compilation
+        # keys which can be created by async container without any awaits
+        self.sync_subgraphs: set[DependencyKey] = set()
+        # dependencies of factories which can be resolved concurrently
+        self.concurrent_groups: dict[
+            DependencyKey, tuple[tuple[DependencyKey, ...], ...],
+        ] = {}
+        # dependencies with their slots created when scope is entered,
+        # split into groups which can be created concurrently
+        self.eager_groups: tuple[
+            tuple[tuple[DependencyKey, int], ...], ...,
+        ] = ()
+        # scopes of parent registries providing keys missing in this one
+        self.owners: dict[DependencyKey, BaseScope] = {}
+        # skipped scope without own factories except context variables,
+        # its container is not created unless the scope is entered directly
+        self.collapsed = False
+        # closed containers entered from parent scope, with their
+        # context wrappers. Used only if the next scope is not specified
+        self.pool: ContainerPool[Any] | None = None
+        if pool_size:
+            self.pool = ContainerPool(pool_size)
 
     def add_factory(
             self,
             factory: Factory,
-            provides: DependencyKey| None = None,
-    ) -> None:
+            provides: DependencyKey | None = None,
+            *,
+            has_slot: bool = True,
+    ) -> Factory:
+        """Add copy of factory with interned keys and return it."""
+        keys = self.keys
         if provides is None:
             provides = factory.provides
+        provides = keys.intern(provides)
+        # factories of providers can be shared by several containers,
+        # so keys are interned in a copy
+        factory = Factory(
+            dependencies=[
+                keys.intern(dependency)
+                for dependency in factory.dependencies
+            ],
+            kw_dependencies={
+                name: keys.intern(dependency)
+                for name, dependency in factory.kw_dependencies.items()
+            },
+            source=factory.source,
+            provides=keys.intern(factory.provides),
+            scope=factory.scope,
+            type_=factory.type,
+            is_to_bind=factory.is_to_bind,
+            cache=factory.cache,
+            override=factory.override,
+            concurrent=factory.concurrent,
+            run_in_thread=factory.run_in_thread,
+            eager=factory.eager,
+        )
         self.factories[provides] = factory
+        if factory.type in (
+            FactoryType.GENERATOR, FactoryType.ASYNC_GENERATOR,
+        ):
+            self.has_finalizers = True
+        if has_slot and provides not in self.slots:
+            self.slots[provides] = len(self.slots)
+        return factory
+
+    def make_context(
+            self, context: Mapping[Any, Any] | None,
+    ) -> Mapping[DependencyKey, Any]:
+        if not context:
+            return EMPTY_CONTEXT
+        from_dependency = self.keys.from_dependency
+        return {from_dependency(key): value for key, value in context.items()}
+
+    def make_cache(self, context: Mapping[DependencyKey, Any]) -> list[Any]:
+        # Cells are added when the first object is created in container,
+        # so containers which create nothing keep their cache empty
+        cache: list[Any] = []
+        self.fill_cache(cache, context)
+        return cache
+
+    def fill_cache(
+            self, cache: list[Any], context: Mapping[DependencyKey, Any],
+    ) -> None:
+        slots = self.slots
+        for key, value in context.items():
+            slot = slots.get(key)
+            if slot is None:
+                continue
+            if slot >= len(cache):
+                cache.extend([MISSING] * (slot + 1 - len(cache)))
+            cache[slot] = value
+
+    def reset_cache(
+            self, cache: list[Any], context: Mapping[DependencyKey, Any],
+    ) -> None:
+        # size is kept, so reused container does not grow it again
+        cache[:] = [MISSING] * len(cache)
+        self.fill_cache(cache, context)
 
     def get_compiled(
             self, dependency: DependencyKey,
@@ -47,26 +192,68 @@ class Registry:
         try:
             return self.compiled[dependency]
         except KeyError:
+            pass
+        with self.compile_lock:
+            if dependency in self.compiled:
+                return self.compiled[dependency]
             factory = self.get_factory(dependency)
             if not factory:
                 return None
-            compiled = compile_factory(factory=factory, is_async=False)
+            compiled = self._compile(factory, is_async=False)
             self.compiled[dependency] = compiled
             return compiled
 
     def get_compiled_async(
             self, dependency: DependencyKey,
-    ) -> CompiledFactory | None:
+    ) -> CompiledAsyncFactory | None:
         try:
-            return self.compiled[dependency]
+            return self.compiled_async[dependency]
         except KeyError:
+            pass
+        with self.compile_lock:
+            if dependency in self.compiled_async:
+                return self.compiled_async[dependency]
             factory = self.get_factory(dependency)
             if not factory:
                 return None
-            compiled = compile_factory(factory=factory, is_async=True)
-            self.compiled[dependency] = compiled
+            # typing.cast is applied as async factory is compiled
+            compiled = cast(
+                CompiledAsyncFactory,
+                self._compile(factory, is_async=True),
+            )
+            self.compiled_async[dependency] = compiled
             return compiled
 
+    def compile_all(self, *, is_async: bool) -> None:
+        """Compile all known factories of this registry in advance."""
+        for dependency in tuple(self.factories):
+            if is_async and dependency not in self.sync_subgraphs:
+                self.get_compiled_async(dependency)
+            else:
+                self.get_compiled(dependency)
+
+    def _compile(
+            self, factory: Factory, *, is_async: bool,
+    ) -> CompiledFactory:
+        if self.inline_compilation:
+            return compile_graph(
+                factory=factory,
+                get_factory=self.get_factory,
+                slots=self.slots,
+                is_async=is_async,
+                sync_dependencies=self.sync_subgraphs,
+                concurrent_groups=self.concurrent_groups,
+            )
+        return compile_factory(
+            factory=factory,
+            is_async=is_async,
+            sync_dependencies=self.sync_subgraphs,
+            slots=self.slots,
+            concurrent_groups=self.concurrent_groups.get(
+                factory.provides, (),
+            ),
+        )
+
     def get_factory(self, dependency: DependencyKey) -> Factory | None:
         try:
             return self.factories[dependency]
@@ -86,9 +273,9 @@ class Registry:
                     dependency.type_hint,
             ):
                 return None
-            factory = self._specialize_generic(factory, dependency)
-            self.factories[dependency] = factory
-            return factory
+            return self.add_factory(
+                self._specialize_generic(factory, dependency), dependency,
+            )
 
     def _get_type_var_factory(self, dependency: DependencyKey) -> Factory:
         args = get_args(dependency.type_hint)
@@ -151,4 +338,22 @@ class Registry:
             scope=factory.scope,
             cache=factory.cache,
             override=factory.override,
+            concurrent=factory.concurrent,
+            run_in_thread=factory.run_in_thread,
+            eager=factory.eager,
         )
+
+
+def skip_collapsed(registries: tuple[Registry, ...]) -> tuple[Registry, ...]:
+    """
+    Skip registries of collapsed scopes at the beginning.
+
+    Context variables of those scopes are found in context of the
+    container created for the next registry.
+    """
+    index = 0
+    while index < len(registries) - 1 and registries[index].collapsed:
+        index += 1
+    if not index:
+        return registries
+    return registries[index:]
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any, TypeVar, cast, get_origin
 
 from ._adaptix.type_tools.basic_utils import is_generic
@@ -11,7 +11,11 @@ from .dependency_source import (
 )
 from .entities.component import DEFAULT_COMPONENT, Component
 from .entities.factory_type import FactoryType
-from .entities.key import DependencyKey
+from .entities.finalization_settings import (
+    DEFAULT_FINALIZATION,
+    FinalizationSettings,
+)
+from .entities.key import DependencyKey, hint_to_dependency_key
 from .entities.scope import BaseScope, InvalidScopes, Scope
 from .entities.validation_settigs import ValidationSettings
 from .exceptions import (
@@ -24,10 +28,19 @@ from .exceptions import (
     NothingOverriddenError,
     UnknownScopeError,
 )
+from .key_table import KeyTable
+from .leak_tracker import LeakTracker
 from .provider import BaseProvider
-from .registry import Registry
+from .registry import LockPolicy, Registry
 
 DECORATED_COMPONENT_PREFIX = "__Dishka_decorate_"
+SYNC_FACTORY_TYPES = frozenset({
+    FactoryType.FACTORY,
+    FactoryType.GENERATOR,
+    FactoryType.VALUE,
+    FactoryType.ALIAS,
+    FactoryType.CONTEXT,
+})
 
 
 class GraphValidator:
@@ -115,6 +128,171 @@ class GraphValidator:
         return found
 
 
+def _find_factory(
+        registries: Sequence[Registry],
+        key: DependencyKey,
+        registry_index: int,
+) -> tuple[int, Factory] | None:
+    """
+    Find index of the nearest registry providing `key` and its factory.
+
+    Generic factories are specialized as it is done on resolution.
+    """
+    for index in range(registry_index, -1, -1):
+        factory = registries[index].get_factory(key)
+        if factory is not None:
+            return index, factory
+    return None
+
+
+class SyncSubgraphFinder:
+    """Find dependencies which can be created without any awaits."""
+
+    def __init__(self, registries: Sequence[Registry]) -> None:
+        self.registries = registries
+        self.path: set[tuple[int, DependencyKey]] = set()
+        self.results: dict[tuple[int, DependencyKey], bool] = {}
+
+    def _is_sync(self, key: DependencyKey, registry_index: int) -> bool:
+        found = _find_factory(self.registries, key, registry_index)
+        if found is None:
+            return False
+        owner, factory = found
+        node = owner, key
+        if node in self.results:
+            return self.results[node]
+        if node in self.path:
+            return False
+        if factory.type not in SYNC_FACTORY_TYPES or factory.run_in_thread:
+            self.results[node] = False
+            return False
+        self.path.add(node)
+        try:
+            result = all(
+                self._is_sync(dep, owner)
+                for dep in (
+                    *factory.dependencies,
+                    *factory.kw_dependencies.values(),
+                )
+            )
+        finally:
+            self.path.remove(node)
+        self.results[node] = result
+        return result
+
+    def find(self) -> None:
+        for index, registry in enumerate(self.registries):
+            for owner in range(index, -1, -1):
+                # factories can be added while specializing generics
+                for key in tuple(self.registries[owner].factories):
+                    found = _find_factory(self.registries, key, index)
+                    if found is None or found[0] != owner:
+                        continue
+                    if self._is_sync(key, index):
+                        registry.sync_subgraphs.add(key)
+
+
+class ConcurrentGroupsFinder:
+    """
+    Split dependencies of factories into groups sharing no objects.
+
+    The same is done for eager dependencies of each scope.
+    """
+
+    def __init__(
+            self, registries: Sequence[Registry], *, concurrent: bool,
+    ) -> None:
+        self.registries = registries
+        self.concurrent = concurrent
+        self.path: set[tuple[int, DependencyKey]] = set()
+        self.closures: dict[
+            tuple[int, DependencyKey], frozenset[tuple[int, DependencyKey]],
+        ] = {}
+
+    def _closure(
+            self, key: DependencyKey, registry_index: int,
+    ) -> frozenset[tuple[int, DependencyKey]]:
+        """Find all cached objects which are created to get `key`."""
+        found = _find_factory(self.registries, key, registry_index)
+        if found is None:
+            return frozenset()
+        owner, factory = found
+        node = owner, key
+        if node in self.closures:
+            return self.closures[node]
+        if node in self.path:
+            return frozenset()
+        self.path.add(node)
+        try:
+            result = frozenset().union(*(
+                self._closure(dep, owner)
+                for dep in (
+                    *factory.dependencies,
+                    *factory.kw_dependencies.values(),
+                )
+            ))
+        finally:
+            self.path.remove(node)
+        if factory.cache and factory.type is not FactoryType.CONTEXT:
+            result |= {node}
+        self.closures[node] = result
+        return result
+
+    def _find_groups(
+            self,
+            dependencies: Iterable[DependencyKey],
+            registry_index: int,
+            *,
+            skip_sync: bool = True,
+    ) -> list[list[DependencyKey]]:
+        registry = self.registries[registry_index]
+        groups: list[tuple[list[DependencyKey], set[Any]]] = []
+        for dep in dict.fromkeys(dependencies):
+            dep_factory = registry.get_factory(dep)
+            if (
+                dep_factory is None
+                or not dep_factory.cache
+                or dep_factory.type is FactoryType.CONTEXT
+                or (skip_sync and dep in registry.sync_subgraphs)
+            ):
+                continue
+            keys = [dep]
+            # objects of parent scopes are created once under the lock
+            # of their container, so they do not prevent concurrency
+            closure = {
+                node for node in self._closure(dep, registry_index)
+                if node[0] == registry_index
+            }
+            for group in [g for g in groups if g[1] & closure]:
+                groups.remove(group)
+                keys = group[0] + keys
+                closure |= group[1]
+            groups.append((keys, closure))
+        return [keys for keys, _ in groups]
+
+    def find(self) -> None:
+        for index, registry in enumerate(self.registries):
+            eager = []
+            # factories can be added while specializing generics
+            for key, factory in tuple(registry.factories.items()):
+                if factory.eager:
+                    eager.append(key)
+                if not (self.concurrent or factory.concurrent):
+                    continue
+                groups = self._find_groups(
+                    (*factory.dependencies, *factory.kw_dependencies.values()),
+                    index,
+                )
+                if len(groups) > 1:
+                    registry.concurrent_groups[key] = tuple(
+                        tuple(group) for group in groups
+                    )
+            registry.eager_groups = tuple(
+                tuple((key, registry.slots[key]) for key in group)
+                for group in self._find_groups(eager, index, skip_sync=False)
+            )
+
+
 class RegistryBuilder:
     def __init__(
             self,
@@ -124,6 +302,14 @@ class RegistryBuilder:
             container_key: DependencyKey,
             skip_validation: bool,
             validation_settings: ValidationSettings,
+            inline_compilation: bool = False,
+            specializations: Sequence[Any] = (),
+            concurrent: bool = False,
+            lock_policy: LockPolicy | None = None,
+            find_sync_subgraphs: bool = True,
+            finalization: FinalizationSettings = DEFAULT_FINALIZATION,
+            pool_size: int = 0,
+            leak_tracker: LeakTracker | None = None,
     ) -> None:
         self.scopes = scopes
         self.providers = providers
@@ -137,6 +323,14 @@ class RegistryBuilder:
         self.skip_validation = skip_validation
         self.validation_settings = validation_settings
         self.processed_factories: dict[DependencyKey, Factory] = {}
+        self.inline_compilation = inline_compilation
+        self.specializations = specializations
+        self.concurrent = concurrent
+        self.lock_policy: LockPolicy = lock_policy or {}
+        self.pool_size = pool_size
+        self.leak_tracker = leak_tracker
+        self.find_sync_subgraphs = find_sync_subgraphs
+        self.finalization = finalization
 
     def _collect_components(self) -> None:
         for provider in self.providers:
@@ -168,16 +362,35 @@ class RegistryBuilder:
                 self.aliases[provides] = alias
 
     def _init_registries(self) -> None:
+        for scope in self.lock_policy:
+            if not isinstance(scope, self.scopes):
+                raise UnknownScopeError(
+                    scope, self.scopes, extend_message="in lock policy",
+                )
         has_fallback = True
+        keys = KeyTable()
         for scope in self.scopes:
-            registry = Registry(scope, has_fallback=has_fallback)
+            registry = Registry(
+                scope,
+                has_fallback=has_fallback,
+                inline_compilation=self.inline_compilation,
+                keys=keys,
+                lock_policy=self.lock_policy,
+                finalization=self.finalization,
+                pool_size=self.pool_size,
+                leak_tracker=self.leak_tracker,
+            )
             context_var = ContextVariable(
                 provides=self.container_key,
                 scope=scope,
                 override=False,
             )
             for component in self.components:
-                registry.add_factory(context_var.as_factory(component))
+                # container is not stored in its own cache,
+                # so it is freed without cyclic garbage collector
+                registry.add_factory(
+                    context_var.as_factory(component), has_slot=False,
+                )
             self.registries[scope] = registry
             has_fallback = False
 
@@ -438,11 +651,49 @@ class RegistryBuilder:
                 else:
                     self._process_normal_decorator(provider, decorator)
         self._post_process_generic_factories()
+        self._process_specializations()
         registries = list(self.registries.values())
         if not self.skip_validation:
             GraphValidator(registries).validate()
+        if self.find_sync_subgraphs:
+            SyncSubgraphFinder(registries).find()
+        ConcurrentGroupsFinder(registries, concurrent=self.concurrent).find()
+        self._collect_owners(registries)
+        self._collapse_scopes(registries)
         return tuple(registries)
 
+    def _collapse_scopes(self, registries: list[Registry]) -> None:
+        # the first registry is always entered as it has fallback factories
+        for registry in registries[1:]:
+            registry.collapsed = registry.scope.skip and all(
+                factory.type is FactoryType.CONTEXT
+                or factory.provides.type_hint is self.container_key.type_hint
+                for factory in registry.factories.values()
+            )
+
+    def _collect_owners(self, registries: list[Registry]) -> None:
+        owners: dict[DependencyKey, BaseScope] = {}
+        for registry in registries:
+            registry.owners = {
+                key: scope
+                for key, scope in owners.items()
+                if key not in registry.factories
+            }
+            for key in registry.factories:
+                owners[key] = registry.scope
+
+    def _process_specializations(self) -> None:
+        for hint in self.specializations:
+            key = hint_to_dependency_key(hint).with_component(
+                DEFAULT_COMPONENT,
+            )
+            for registry in self.registries.values():
+                if registry.get_factory(key):
+                    break
+            else:
+                if not self.skip_validation:
+                    raise GraphMissingFactoryError(requested=key)
+
     def _post_process_generic_factories(self) -> None:
         found = [
             (registry, factory)
@@ -0,0 +1,139 @@
+from inspect import Parameter, signature
+from typing import Any
+
+import pytest
+
+from dishka import (
+    AsyncContainer,
+    Container,
+    FromDishka,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.integrations.base import wrap_injection
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_int(self) -> int:
+        return 1
+
+    @provide
+    def get_str(self) -> str:
+        return "str"
+
+
+CONTAINER_PARAM = Parameter(
+    "dishka_container",
+    Parameter.KEYWORD_ONLY,
+    annotation=object,
+)
+
+
+def sync_func(
+        a: int,
+        /,
+        *args: str,
+        b: FromDishka[int],
+        c: FromDishka[str],
+        **kwargs: str,
+) -> tuple:
+    return a, b, args, c, kwargs
+
+
+def test_sync():
+    container = make_container(MyProvider())
+    wrapped = wrap_injection(
+        func=sync_func,
+        container_getter=lambda _, p: p["dishka_container"],
+        additional_params=[CONTAINER_PARAM],
+    )
+    assert list(signature(wrapped).parameters) == [
+        "a", "args", "dishka_container", "kwargs",
+    ]
+    assert wrapped(
+        0, "x", dishka_container=container, d="y",
+    ) == (0, 1, ("x",), "str", {"d": "y"})
+
+
+def sync_gen(a: int, b: FromDishka[int]):
+    yield a
+    yield b
+
+
+def test_generator():
+    container = make_container(MyProvider())
+    wrapped = wrap_injection(
+        func=sync_gen,
+        container_getter=lambda _, __: container,
+    )
+    assert list(wrapped(a=0)) == [0, 1]
+
+
+async def async_func(b: FromDishka[int], c: FromDishka[str]) -> tuple:
+    return b, c
+
+
+async def async_gen(b: FromDishka[int]):
+    yield b
+
+
+@pytest.mark.asyncio
+async def test_async():
+    container = make_async_container(MyProvider())
+    wrapped = wrap_injection(
+        func=async_func,
+        container_getter=lambda _, __: container,
+        is_async=True,
+    )
+    assert await wrapped() == (1, "str")
+
+    wrapped_gen = wrap_injection(
+        func=async_gen,
+        container_getter=lambda _, __: container,
+        is_async=True,
+    )
+    assert [x async for x in wrapped_gen()] == [1]
+
+
+class GetOnlyContainer:
+    def __init__(self, container: Container) -> None:
+        self.container = container
+
+    def get(self, dependency_type: Any, component: str | None = "") -> Any:
+        return self.container.get(dependency_type, component=component)
+
+
+def test_no_get_many():
+    container = GetOnlyContainer(make_container(MyProvider()))
+    wrapped = wrap_injection(
+        func=sync_gen,
+        container_getter=lambda _, __: container,
+    )
+    assert list(wrapped(a=0)) == [0, 1]
+
+
+class AsyncGetOnlyContainer:
+    def __init__(self, container: AsyncContainer) -> None:
+        self.container = container
+
+    async def get(
+            self, dependency_type: Any, component: str | None = "",
+    ) -> Any:
+        return await self.container.get(dependency_type, component=component)
+
+
+@pytest.mark.asyncio
+async def test_no_get_many_async():
+    container = AsyncGetOnlyContainer(make_async_container(MyProvider()))
+    wrapped = wrap_injection(
+        func=async_func,
+        container_getter=lambda _, __: container,
+        is_async=True,
+    )
+    assert await wrapped() == (1, "str")
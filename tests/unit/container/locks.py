@@ -0,0 +1,30 @@
+import asyncio
+from threading import Lock
+
+
+class CountingLock:
+    entered = 0
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+
+    def __enter__(self) -> None:
+        CountingLock.entered += 1
+        self.lock.acquire()
+
+    def __exit__(self, *args: object) -> None:
+        self.lock.release()
+
+
+class AsyncCountingLock:
+    entered = 0
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        AsyncCountingLock.entered += 1
+        await self.lock.acquire()
+
+    async def __aexit__(self, *args: object) -> None:
+        self.lock.release()
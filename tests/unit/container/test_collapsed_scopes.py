@@ -0,0 +1,75 @@
+from typing import NewType
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    from_context,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import NoContextValueError
+
+WebSocket = NewType("WebSocket", str)
+Handler = NewType("Handler", str)
+Session = NewType("Session", str)
+
+
+class MyProvider(Provider):
+    websocket = from_context(provides=WebSocket, scope=Scope.SESSION)
+
+    @provide(scope=Scope.REQUEST)
+    def get_handler(self, websocket: WebSocket) -> Handler:
+        return Handler(f"handler {websocket}")
+
+
+def test_empty_scope():
+    provider = Provider(scope=Scope.REQUEST)
+    provider.provide(lambda: 1, provides=int)
+    container = make_container(provider)
+    with container() as request_container:
+        assert request_container.parent_container is container
+        assert request_container.get(int) == 1
+
+
+def test_context_only():
+    container = make_container(MyProvider())
+    with container({WebSocket: "ws"}) as request_container:
+        assert request_container.parent_container is container
+        assert request_container.get(Handler) == "handler ws"
+    with (
+        container() as request_container,
+        pytest.raises(NoContextValueError),
+    ):
+        request_container.get(Handler)
+
+
+def test_enter_directly():
+    container = make_container(MyProvider())
+    with (
+        container({WebSocket: "ws"}, scope=Scope.SESSION) as session_container,
+        session_container() as request_container,
+    ):
+        assert session_container.scope is Scope.SESSION
+        assert request_container.get(Handler) == "handler ws"
+
+
+def test_not_collapsed():
+    provider = MyProvider()
+    provider.provide(
+        lambda: Session("session"), provides=Session, scope=Scope.SESSION,
+    )
+    container = make_container(provider)
+    with container({WebSocket: "ws"}) as request_container:
+        assert request_container.parent_container.scope is Scope.SESSION
+        assert request_container.get(Session) == "session"
+
+
+@pytest.mark.asyncio
+async def test_context_only_async():
+    container = make_async_container(MyProvider())
+    async with container({WebSocket: "ws"}) as request_container:
+        assert request_container.parent_container is container
+        assert await request_container.get(Handler) == "handler ws"
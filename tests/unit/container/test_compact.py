@@ -0,0 +1,70 @@
+from collections.abc import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import NoContextValueError
+
+
+class MyProvider(Provider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.finalizer = Mock()
+        self.from_context(provides=float, scope=Scope.ACTION)
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> Iterator[int]:
+        yield 1
+        self.finalizer()
+
+    @provide(scope=Scope.ACTION)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+
+def test_empty_context_copied():
+    container = make_container(MyProvider())
+    with container() as request_container:
+        with request_container() as first, request_container() as second:
+            with pytest.deprecated_call():
+                first.context[DependencyKey(float, DEFAULT_COMPONENT)] = 1.5
+            assert first.get(float) == 1.5
+            with pytest.raises(NoContextValueError):
+                second.get(float)
+        with request_container() as third, pytest.raises(NoContextValueError):
+            third.get(float)
+
+
+def test_no_finalizers():
+    provider = MyProvider()
+    container = make_container(provider)
+    with container() as request_container:
+        for _ in range(2):
+            with request_container() as action_container:
+                assert action_container.get(str) == "1"
+    provider.finalizer.assert_not_called()
+    container.close()
+    provider.finalizer.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_no_finalizers_async():
+    provider = MyProvider()
+    container = make_async_container(provider)
+    async with (
+        container() as request_container,
+        request_container({float: 1.5}) as action_container,
+    ):
+        assert await action_container.get(str) == "1"
+        assert await action_container.get(float) == 1.5
+    await container.close()
+    provider.finalizer.assert_called_once()
@@ -0,0 +1,81 @@
+from typing import Generic, TypeVar
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import GraphMissingFactoryError
+
+T = TypeVar("T")
+
+
+class Repo(Generic[T]):
+    def __init__(self, value: T) -> None:
+        self.value = value
+
+
+class MyProvider(Provider):
+    def __init__(self, mock: Mock):
+        super().__init__()
+        self.mock = mock
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return self.mock()
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+    repo = provide(Repo, scope=Scope.APP)
+
+
+def test_compile_eagerly():
+    mock = Mock(return_value=1)
+    container = make_container(
+        MyProvider(mock),
+        compile_eagerly=True,
+        specializations=[Repo[int]],
+    )
+    mock.assert_not_called()
+    assert DependencyKey(int, DEFAULT_COMPONENT) in container.registry.compiled
+    repo_key = DependencyKey(Repo[int], DEFAULT_COMPONENT)
+    assert repo_key in container.registry.compiled
+    with container() as request_container:
+        assert DependencyKey(str, DEFAULT_COMPONENT) in (
+            request_container.registry.compiled
+        )
+        assert request_container.get(str) == "1"
+    assert container.get(Repo[int]).value == 1
+
+
+@pytest.mark.asyncio
+async def test_compile_eagerly_async():
+    mock = Mock(return_value=1)
+    container = make_async_container(
+        MyProvider(mock),
+        compile_eagerly=True,
+        specializations=[Repo[int]],
+    )
+    mock.assert_not_called()
+    async with container() as request_container:
+        assert await request_container.get(str) == "1"
+    assert (await container.get(Repo[int])).value == 1
+
+
+def test_lazy_by_default():
+    container = make_container(MyProvider(Mock()))
+    assert not container.registry.compiled
+
+
+def test_unknown_specialization():
+    with pytest.raises(GraphMissingFactoryError):
+        make_container(MyProvider(Mock()), specializations=[list[int]])
@@ -0,0 +1,280 @@
+import asyncio
+from collections.abc import AsyncIterable
+from typing import Generic, NewType, TypeVar
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    factory_compiler,
+    make_async_container,
+    provide,
+)
+
+Left = NewType("Left", str)
+Right = NewType("Right", str)
+Shared = NewType("Shared", str)
+Other = NewType("Other", str)
+T = TypeVar("T")
+
+
+class Result:
+    def __init__(self, left: Left, right: Right) -> None:
+        self.left = left
+        self.right = right
+
+
+class SharedResult:
+    def __init__(self, left: Left, other: Other) -> None:
+        self.left = left
+        self.other = other
+
+
+class ConcurrentProvider(Provider):
+    """Left and right wait for each other, so they must run together."""
+
+    scope = Scope.REQUEST
+
+    def __init__(self, finalizer: Mock) -> None:
+        super().__init__()
+        self.finalizer = finalizer
+        self.left_started = asyncio.Event()
+        self.right_started = asyncio.Event()
+
+    @provide
+    async def get_left(self) -> AsyncIterable[Left]:
+        self.left_started.set()
+        await self.right_started.wait()
+        yield Left("left")
+        self.finalizer("left")
+
+    @provide
+    async def get_right(self) -> AsyncIterable[Right]:
+        self.right_started.set()
+        await self.left_started.wait()
+        yield Right("right")
+        self.finalizer("right")
+
+    @provide
+    async def get_result(
+            self, left: Left, right: Right,
+    ) -> AsyncIterable[Result]:
+        yield Result(left, right)
+        self.finalizer("result")
+
+
+@pytest.mark.parametrize("inline_compilation", [False, True])
+@pytest.mark.asyncio
+async def test_concurrent(*, inline_compilation):
+    finalizer = Mock()
+    container = make_async_container(
+        ConcurrentProvider(finalizer),
+        concurrent=True,
+        inline_compilation=inline_compilation,
+    )
+    async with container() as request_container:
+        result = await asyncio.wait_for(
+            request_container.get(Result), timeout=1,
+        )
+        assert result.left == "left"
+        assert result.right == "right"
+    assert finalizer.call_args_list[0].args == ("result",)
+    assert finalizer.call_count == 3
+
+
+class FactoryProvider(ConcurrentProvider):
+    @provide
+    async def get_result(self, left: Left, right: Right) -> Result:
+        return Result(left, right)
+
+
+@pytest.mark.parametrize(
+    "provider_class", [ConcurrentProvider, FactoryProvider],
+)
+@pytest.mark.asyncio
+async def test_resolved_once(monkeypatch, provider_class):
+    resolve = Mock(wraps=factory_compiler.resolve_concurrently)
+    monkeypatch.setattr(factory_compiler, "resolve_concurrently", resolve)
+    container = make_async_container(provider_class(Mock()), concurrent=True)
+    async with container() as request_container:
+        await asyncio.wait_for(request_container.get(Result), timeout=1)
+    resolve.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_provide():
+    class MyProvider(ConcurrentProvider):
+        result = provide(Result, concurrent=True)
+
+    container = make_async_container(MyProvider(Mock()))
+    async with container() as request_container:
+        result = await asyncio.wait_for(
+            request_container.get(Result), timeout=1,
+        )
+        assert result.left == "left"
+
+
+class SharedProvider(Provider):
+    scope = Scope.REQUEST
+
+    def __init__(self, mock: Mock) -> None:
+        super().__init__()
+        self.mock = mock
+
+    @provide
+    async def get_shared(self) -> Shared:
+        await asyncio.sleep(0)
+        return self.mock()
+
+    @provide
+    async def get_left(self, shared: Shared) -> Left:
+        return Left(shared)
+
+    @provide
+    async def get_other(self, shared: Shared) -> Other:
+        return Other(shared)
+
+    shared_result = provide(SharedResult)
+
+
+@pytest.mark.asyncio
+async def test_shared_dependency():
+    mock = Mock(return_value="shared")
+    container = make_async_container(SharedProvider(mock), concurrent=True)
+    async with container() as request_container:
+        assert request_container.registry.concurrent_groups == {}
+        result = await request_container.get(SharedResult)
+        assert result.left == result.other == "shared"
+    mock.assert_called_once()
+
+
+def test_groups():
+    container = make_async_container(
+        ConcurrentProvider(Mock()), concurrent=True,
+    )
+    request_registry = container.child_registries[1]
+    groups = request_registry.concurrent_groups[
+        DependencyKey(Result, DEFAULT_COMPONENT)
+    ]
+    assert groups == (
+        (DependencyKey(Left, DEFAULT_COMPONENT),),
+        (DependencyKey(Right, DEFAULT_COMPONENT),),
+    )
+
+
+Config = NewType("Config", str)
+
+
+class SharedParentProvider(Provider):
+    """Left and right use the same APP-scoped config."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.config_created = Mock()
+        self.left_started = asyncio.Event()
+        self.right_started = asyncio.Event()
+
+    @provide(scope=Scope.APP)
+    async def get_config(self) -> Config:
+        self.config_created()
+        await asyncio.sleep(0)
+        return Config("config")
+
+    @provide(scope=Scope.REQUEST)
+    async def get_left(self, config: Config) -> Left:
+        self.left_started.set()
+        await self.right_started.wait()
+        return Left(config)
+
+    @provide(scope=Scope.REQUEST)
+    async def get_right(self, config: Config) -> Right:
+        self.right_started.set()
+        await self.left_started.wait()
+        return Right(config)
+
+    result = provide(Result, scope=Scope.REQUEST)
+
+
+@pytest.mark.asyncio
+async def test_shared_parent_dependency():
+    provider = SharedParentProvider()
+    container = make_async_container(provider, concurrent=True)
+    async with container() as request_container:
+        result = await asyncio.wait_for(
+            request_container.get(Result), timeout=1,
+        )
+        assert result.left == result.right == "config"
+    provider.config_created.assert_called_once()
+
+
+class Repo(Generic[T]):
+    pass
+
+
+class Repos:
+    def __init__(self, users: Repo[int], orders: Repo[str]) -> None:
+        self.users = users
+        self.orders = orders
+
+
+class GenericProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    async def get_repo(self, type_: type[T]) -> Repo[T]:
+        return Repo()
+
+    repos = provide(Repos)
+
+
+def test_generic_groups():
+    container = make_async_container(
+        GenericProvider(), concurrent=True, skip_validation=True,
+    )
+    request_registry = container.child_registries[1]
+    groups = request_registry.concurrent_groups[
+        DependencyKey(Repos, DEFAULT_COMPONENT)
+    ]
+    assert groups == (
+        (DependencyKey(Repo[int], DEFAULT_COMPONENT),),
+        (DependencyKey(Repo[str], DEFAULT_COMPONENT),),
+    )
+
+
+class FailingProvider(Provider):
+    scope = Scope.REQUEST
+
+    def __init__(self, cancelled: Mock) -> None:
+        super().__init__()
+        self.cancelled = cancelled
+
+    @provide
+    async def get_left(self) -> Left:
+        raise ValueError
+
+    @provide
+    async def get_right(self) -> Right:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled()
+            raise
+        return Right("right")  # pragma: no cover
+
+    result = provide(Result)
+
+
+@pytest.mark.asyncio
+async def test_error():
+    cancelled = Mock()
+    container = make_async_container(
+        FailingProvider(cancelled), concurrent=True,
+    )
+    async with container() as request_container:
+        with pytest.raises(ValueError):  # noqa: PT011
+            await request_container.get(Result)
+    cancelled.assert_called_once()
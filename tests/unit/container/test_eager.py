@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import NewType
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.provider.exceptions import InvalidFactoryOptionsError
+
+Session = NewType("Session", str)
+Span = NewType("Span", str)
+Trace = NewType("Trace", str)
+
+
+class AsyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.session_started = asyncio.Event()
+        self.span_started = asyncio.Event()
+
+    @provide(eager=True)
+    async def get_session(self) -> Session:
+        self.session_started.set()
+        await self.span_started.wait()
+        return Session("session")
+
+    @provide(eager=True)
+    async def get_span(self) -> Span:
+        self.span_started.set()
+        await self.session_started.wait()
+        return Span("span")
+
+
+@pytest.mark.asyncio
+async def test_eager_async():
+    container = make_async_container(AsyncProvider())
+
+    async def enter() -> None:
+        async with container():
+            pass
+
+    # factories wait for each other, so they are created concurrently
+    await asyncio.wait_for(enter(), 1)
+
+
+Config = NewType("Config", str)
+
+
+class SharedParentProvider(AsyncProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.config_created = Mock()
+
+    @provide(scope=Scope.APP)
+    def get_config(self) -> Config:
+        self.config_created()
+        return Config("config")
+
+    @provide(eager=True)
+    async def get_session(self, config: Config) -> Session:
+        self.session_started.set()
+        await self.span_started.wait()
+        return Session(config)
+
+    @provide(eager=True)
+    async def get_span(self, config: Config) -> Span:
+        self.span_started.set()
+        await self.session_started.wait()
+        return Span(config)
+
+
+@pytest.mark.asyncio
+async def test_eager_shared_parent_dependency():
+    provider = SharedParentProvider()
+    container = make_async_container(provider)
+
+    async def enter() -> None:
+        async with container():
+            pass
+
+    await asyncio.wait_for(enter(), 1)
+    provider.config_created.assert_called_once()
+
+
+def test_eager_not_cached():
+    provider = Provider(scope=Scope.REQUEST)
+    with pytest.raises(InvalidFactoryOptionsError, match="must be cached"):
+        provider.provide(lambda: 1, provides=int, eager=True, cache=False)
+
+
+class SyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(2, timeout=1)
+        self.finalizer = Mock()
+
+    @provide(eager=True)
+    def get_session(self) -> Iterator[Session]:
+        self.barrier.wait()
+        yield Session("session")
+        self.finalizer()
+
+    @provide(eager=True)
+    def get_span(self) -> Span:
+        self.barrier.wait()
+        return Span("span")
+
+
+def test_eager_in_threads():
+    provider = SyncProvider()
+    with ThreadPoolExecutor(2) as executor:
+        container = make_container(provider, eager_executor=executor)
+        with container() as request_container:
+            assert provider.barrier.n_waiting == 0
+            assert request_container.get(Span) == "span"
+    provider.finalizer.assert_called_once()
+
+
+def test_eager_failed():
+    provider = SyncProvider()
+
+    class FailingProvider(Provider):
+        scope = Scope.REQUEST
+
+        @provide(eager=True)
+        def get_trace(self, session: Session) -> Trace:
+            raise ValueError("trace")
+
+    provider.barrier = threading.Barrier(1)
+    container = make_container(provider, FailingProvider())
+    with pytest.raises(ValueError, match="trace"), container():
+        pass
+    provider.finalizer.assert_called_once()
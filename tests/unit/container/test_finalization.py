@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from typing import NewType
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    FinalizationSettings,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import ExitError, FinalizerTimeoutError
+
+Pool = NewType("Pool", str)
+Producer = NewType("Producer", str)
+Session = NewType("Session", str)
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self, delay: float = 0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.events: list[str] = []
+
+    @provide
+    async def get_pool(self) -> AsyncIterator[Pool]:
+        yield Pool("pool")
+        self.events.append("pool start")
+        await asyncio.sleep(self.delay)
+        self.events.append("pool end")
+
+    @provide
+    async def get_producer(self) -> AsyncIterator[Producer]:
+        yield Producer("producer")
+        self.events.append("producer start")
+        await asyncio.sleep(self.delay)
+        self.events.append("producer end")
+
+    @provide
+    async def get_session(self, pool: Pool) -> AsyncIterator[Session]:
+        yield Session("session")
+        self.events.append("session")
+
+
+@pytest.mark.asyncio
+async def test_concurrent():
+    provider = MyProvider(delay=0.01)
+    container = make_async_container(
+        provider,
+        finalization_settings=FinalizationSettings(concurrent=True),
+    )
+    await container.get(Producer)
+    await container.get(Session)
+    await container.close()
+    assert provider.events == [
+        "producer start", "session", "pool start", "producer end", "pool end",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_timeout():
+    on_slow = Mock()
+    provider = MyProvider(delay=1)
+    container = make_async_container(
+        provider,
+        finalization_settings=FinalizationSettings(
+            timeout=0.01,
+            slow_threshold=0.005,
+            on_slow=on_slow,
+        ),
+    )
+    await container.get(Pool)
+    with pytest.raises(ExitError) as e:
+        await container.close()
+    assert isinstance(e.value.exceptions[0], FinalizerTimeoutError)
+    on_slow.assert_called_once()
+    assert on_slow.call_args.args[0] == DependencyKey(Pool, DEFAULT_COMPONENT)
+
+
+def test_slow_sync():
+    on_slow = Mock()
+
+    class SyncProvider(Provider):
+        @provide(scope=Scope.APP)
+        def get_pool(self) -> Iterator[Pool]:
+            yield Pool("pool")
+
+    container = make_container(
+        SyncProvider(),
+        finalization_settings=FinalizationSettings(
+            slow_threshold=0,
+            on_slow=on_slow,
+        ),
+    )
+    container.get(Pool)
+    container.close()
+    on_slow.assert_called_once()
+
+
+@pytest.mark.parametrize("settings", [
+    FinalizationSettings(concurrent=True),
+    FinalizationSettings(timeout=1),
+])
+def test_unsupported_sync(settings):
+    with pytest.raises(ValueError, match="Sync container does not support"):
+        make_container(MyProvider(), finalization_settings=settings)
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+import pytest
+
+from dishka import Provider, Scope, make_container, provide
+
+T = TypeVar("T")
+
+
+class Repo(Generic[T]):
+    pass
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_int(self) -> int:
+        return 1
+
+    @provide
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+    @provide
+    def get_repo(self, type_: type[T]) -> Repo[T]:
+        return Repo()
+
+
+def test_compiled_on_start():
+    container = make_container(MyProvider(), free_threaded=True)
+    assert container.lock is None
+    assert container.registry.compiled
+
+
+def test_concurrent_access():
+    container = make_container(MyProvider(), free_threaded=True)
+    dependencies = [float, int, Repo[int], Repo[str], Repo[bytes]] * 20
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(container.get, dependencies))
+    for dependency, result in zip(dependencies, results, strict=True):
+        assert container.get(dependency) is result
+
+
+def test_inline_compilation():
+    with pytest.raises(ValueError, match="free_threaded"):
+        make_container(
+            MyProvider(), free_threaded=True, inline_compilation=True,
+        )
@@ -0,0 +1,63 @@
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import FrozenContainerError
+from .locks import CountingLock
+
+
+class MyProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.APP)
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+
+def test_cache_hit_not_locked():
+    container = make_container(MyProvider(), lock_factory=CountingLock)
+    CountingLock.entered = 0
+    assert container.get(int) == 1
+    assert CountingLock.entered == 1
+    assert container.get(int) == 1
+    assert CountingLock.entered == 1
+    with container(lock_factory=CountingLock) as request_container:
+        assert request_container.get(str) == "1"
+    assert CountingLock.entered == 2  # request container only
+
+
+def test_freeze():
+    container = make_container(MyProvider())
+    container.get(int)
+    container.freeze()
+    assert container.get(int) == 1
+    with pytest.raises(FrozenContainerError):
+        container.get(float)
+    with container() as request_container:
+        assert request_container.get(str) == "1"
+        request_container.freeze()
+        assert request_container.get(str) == "1"
+        assert request_container.get(int) == 1
+
+
+@pytest.mark.asyncio
+async def test_freeze_async():
+    container = make_async_container(MyProvider())
+    await container.get(int)
+    container.freeze()
+    assert await container.get(int) == 1
+    with pytest.raises(FrozenContainerError):
+        await container.get(float)
+    async with container() as request_container:
+        assert await request_container.get(str) == "1"
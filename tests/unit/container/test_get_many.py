@@ -0,0 +1,67 @@
+import pytest
+
+from dishka import (
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import NoFactoryError
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+
+class OtherProvider(Provider):
+    scope = Scope.APP
+    component = "other"
+
+    @provide
+    def get_int(self) -> int:
+        return 2
+
+
+class AsyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    async def get_float(self, value: int) -> float:
+        return value / 2
+
+
+def test_get_many():
+    container = make_container(MyProvider(), OtherProvider())
+    with container() as request_container:
+        assert request_container.get_many([
+            str, int, DependencyKey(int, "other"),
+        ]) == ("1", 1, 2)
+        assert request_container.get_many([]) == ()
+
+
+def test_get_many_missing():
+    container = make_container(MyProvider())
+    with pytest.raises(NoFactoryError):
+        container.get_many([int, float])
+
+
+@pytest.mark.asyncio
+async def test_get_many_async():
+    container = make_async_container(
+        MyProvider(), OtherProvider(), AsyncProvider(),
+    )
+    async with container() as request_container:
+        assert await request_container.get_many([
+            float, str, DependencyKey(int, "other"),
+        ]) == (0.5, "1", 2)
+    await container.close()
@@ -0,0 +1,263 @@
+from collections.abc import AsyncIterable, Callable, Iterable
+from typing import Any, NewType
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    alias,
+    from_context,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import (
+    NoContextValueError,
+    NoFactoryError,
+    UnsupportedFactoryError,
+)
+
+Left = NewType("Left", list)
+Right = NewType("Right", list)
+Other = NewType("Other", list)
+
+
+class Top:
+    def __init__(self, left: Left, right: Right, *, value: float) -> None:
+        self.left = left
+        self.right = right
+        self.value = value
+
+
+class DiamondProvider(Provider):
+    def __init__(self, finalizer: Mock):
+        super().__init__()
+        self.finalizer = finalizer
+
+    value = from_context(provides=int, scope=Scope.APP)
+
+    @provide(scope=Scope.APP)
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+    @provide(scope=Scope.REQUEST)
+    def get_list(self, value: int) -> Iterable[list]:
+        yield [value]
+        self.finalizer()
+
+    @provide(scope=Scope.REQUEST, cache=False)
+    def get_left(self, data: list) -> Left:
+        return Left(list(data))
+
+    right = alias(source=list, provides=Right)
+    top = provide(Top, scope=Scope.REQUEST)
+
+
+def test_diamond():
+    finalizer = Mock()
+    container = make_container(
+        DiamondProvider(finalizer),
+        context={int: 42},
+        inline_compilation=True,
+    )
+    with container() as request_container:
+        top = request_container.get(Top)
+        assert top.left == top.right == [42]
+        assert top.value == 21
+        assert request_container.get(Top) is top
+        assert request_container.get(list) is top.right
+        assert request_container.get(Left) is not top.left
+    finalizer.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_diamond_async():
+    finalizer = Mock()
+    container = make_async_container(
+        DiamondProvider(finalizer),
+        context={int: 42},
+        inline_compilation=True,
+    )
+    async with container() as request_container:
+        top = await request_container.get(Top)
+        assert top.left == top.right == [42]
+        assert top.value == 21
+        assert await request_container.get(Top) is top
+    finalizer.assert_called_once()
+
+
+def test_partially_cached():
+    finalizer = Mock()
+    container = make_container(
+        DiamondProvider(finalizer),
+        context={int: 42},
+        inline_compilation=True,
+    )
+    with container() as request_container:
+        data = request_container.get(list)
+        top = request_container.get(Top)
+        assert top.right is data
+    finalizer.assert_called_once()
+
+
+def test_no_cache():
+    class MyProvider(Provider):
+        scope = Scope.APP
+
+        @provide(cache=False)
+        def get_list(self) -> list:
+            return []
+
+        @provide
+        def get_left(self, data: list) -> Left:
+            return Left(data)
+
+        @provide
+        def get_right(self, data: list) -> Right:
+            return Right(data)
+
+        @provide
+        def get_other(self, left: Left, right: Right) -> Other:
+            return Other([left, right])
+
+    container = make_container(MyProvider(), inline_compilation=True)
+    left, right = container.get(Other)
+    assert left is not right
+
+
+class AsyncProvider(Provider):
+    def __init__(self, finalizer: Mock):
+        super().__init__()
+        self.finalizer = finalizer
+
+    @provide(scope=Scope.APP)
+    async def get_int(self) -> AsyncIterable[int]:
+        yield 1
+        self.finalizer("int")
+
+    @provide(scope=Scope.APP)
+    def get_float(self, value: int) -> Iterable[float]:
+        yield value + 0.5
+        self.finalizer("float")
+
+    @provide(scope=Scope.APP)
+    async def get_str(self, value: float) -> str:
+        return str(value)
+
+
+@pytest.mark.asyncio
+async def test_finalization_order():
+    finalizer = Mock()
+    container = make_async_container(
+        AsyncProvider(finalizer),
+        inline_compilation=True,
+    )
+    assert await container.get(str) == "1.5"
+    await container.close()
+    assert [c.args for c in finalizer.call_args_list] == [
+        ("float",), ("int",),
+    ]
+
+
+def test_async_in_sync():
+    container = make_container(
+        AsyncProvider(Mock()),
+        inline_compilation=True,
+    )
+    with pytest.raises(UnsupportedFactoryError):
+        container.get(str)
+
+
+def test_no_context():
+    class MyProvider(Provider):
+        scope = Scope.APP
+        value = from_context(provides=int)
+
+        @provide
+        def get_str(self, value: int) -> str:
+            return str(value)
+
+    container = make_container(MyProvider(), inline_compilation=True)
+    with pytest.raises(NoContextValueError):
+        container.get(str)
+
+
+def test_missing_path():
+    class MyProvider(Provider):
+        scope = Scope.APP
+
+        @provide
+        def get_float(self, value: int) -> float:
+            return value
+
+        @provide
+        def get_str(self, value: float) -> str:
+            return str(value)
+
+    container = make_container(
+        MyProvider(),
+        skip_validation=True,
+        inline_compilation=True,
+    )
+    with pytest.raises(NoFactoryError) as e:
+        container.get(str)
+    assert [factory.provides.type_hint for factory in e.value.path] == [
+        str, float,
+    ]
+
+
+
+def chain_factory(cls: type, dep: type) -> Callable[..., Any]:
+    def factory(value: Any) -> Any:
+        return (cls, value)
+    factory.__annotations__ = {"value": dep, "return": cls}
+    return factory
+
+
+def diamond_factory(cls: type, left: type, right: type) -> Callable[..., Any]:
+    def factory(left: Any, right: Any) -> Any:
+        return (cls, left, right)
+    factory.__annotations__ = {"left": left, "right": right, "return": cls}
+    return factory
+
+
+def test_long_chain():
+    provider = Provider(scope=Scope.APP)
+    provider.from_context(provides=int)
+    dep: type = int
+    for i in range(120):
+        cls = NewType(f"Chain{i}", tuple)
+        provider.provide(chain_factory(cls, dep), provides=cls)
+        dep = cls
+    container = make_container(
+        provider, context={int: 1}, inline_compilation=True,
+    )
+    value = container.get(dep)
+    for _ in range(120):
+        value = value[1]
+    assert value == 1
+
+
+def test_many_diamonds():
+    calls = Mock()
+
+    def get_int() -> int:
+        calls()
+        return 1
+
+    provider = Provider(scope=Scope.APP)
+    provider.provide(get_int)
+    left: type = int
+    right: type = int
+    for i in range(40):
+        new_left = NewType(f"Left{i}", tuple)
+        new_right = NewType(f"Right{i}", tuple)
+        for cls in (new_left, new_right):
+            provider.provide(diamond_factory(cls, left, right), provides=cls)
+        left, right = new_left, new_right
+    container = make_container(provider, inline_compilation=True)
+    top = container.get(left)
+    assert top[1][1] is top[2][1]
+    calls.assert_called_once()
@@ -0,0 +1,113 @@
+from typing import Generic, TypeVar
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_container,
+    provide,
+)
+from dishka.key_table import KeyTable
+from dishka.registry import Registry
+
+T = TypeVar("T")
+
+
+class Repo(Generic[T]):
+    pass
+
+
+IntRepo = Repo[int]
+
+
+def test_intern():
+    keys = KeyTable()
+    key = keys.intern(DependencyKey(Repo[int], DEFAULT_COMPONENT))
+    assert key == DependencyKey(Repo[int], DEFAULT_COMPONENT)
+    assert hash(key) == hash(DependencyKey(Repo[int], DEFAULT_COMPONENT))
+    assert keys.intern(DependencyKey(Repo[int], DEFAULT_COMPONENT)) is key
+    assert keys.get(Repo[int], DEFAULT_COMPONENT) is key
+    assert keys.get(Repo[int], "other") is not key
+
+
+def test_hashed_key():
+    keys = KeyTable()
+    key = keys.intern(DependencyKey(Repo[int], DEFAULT_COMPONENT))
+    assert not hasattr(key, "__dict__")
+    assert repr(key) == repr(DependencyKey(Repo[int], DEFAULT_COMPONENT))
+    key_hash = hash(key)
+    del keys
+    assert hash(key) == key_hash
+
+
+def test_intern_equal_hint():
+    keys = KeyTable()
+    key = keys.intern(DependencyKey(list[int], DEFAULT_COMPONENT))
+    assert keys.get(list[int], DEFAULT_COMPONENT) is key
+    hint = list[int]
+    assert keys.intern(DependencyKey(hint, DEFAULT_COMPONENT)) is key
+    assert keys.get(hint, DEFAULT_COMPONENT) is key
+
+
+def test_unknown():
+    keys = KeyTable()
+    key = keys.get(int, DEFAULT_COMPONENT)
+    assert key == DependencyKey(int, DEFAULT_COMPONENT)
+    assert keys.get(int, DEFAULT_COMPONENT) is not key
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_int(self) -> int:
+        return 1
+
+    @provide
+    def get_repo(self, value: int) -> IntRepo:
+        return Repo()
+
+
+def test_shared_by_registries():
+    container = make_container(MyProvider())
+    keys = container.registry.keys
+    with container() as request_container:
+        assert request_container.registry.keys is keys
+    factory = container.registry.get_factory(
+        DependencyKey(IntRepo, DEFAULT_COMPONENT),
+    )
+    assert factory.provides is keys.get(IntRepo, DEFAULT_COMPONENT)
+    assert factory.dependencies[0] is keys.get(int, DEFAULT_COMPONENT)
+    assert isinstance(container.get(Repo[int]), Repo)
+
+
+def test_specialization_interned():
+    class GenericProvider(Provider):
+        scope = Scope.APP
+
+        @provide
+        def get_repo(self, value: type[T]) -> Repo[T]:
+            return Repo()
+
+    container = make_container(GenericProvider())
+    registry = container.registry
+    key = DependencyKey(Repo[str], DEFAULT_COMPONENT)
+    factory = registry.get_factory(key)
+    assert factory.provides is registry.keys.get(Repo[str], DEFAULT_COMPONENT)
+    assert registry.get_factory(key) is factory
+
+
+def test_factory_not_changed():
+    container = make_container(MyProvider())
+    factory = container.registry.get_factory(
+        DependencyKey(IntRepo, DEFAULT_COMPONENT),
+    )
+    registry = Registry(Scope.APP, has_fallback=False)
+    registry.add_factory(factory)
+    assert factory.provides is container.registry.keys.get(
+        IntRepo, DEFAULT_COMPONENT,
+    )
+    added = registry.get_factory(factory.provides)
+    assert added.provides is registry.keys.get(IntRepo, DEFAULT_COMPONENT)
+    assert added.provides is not factory.provides
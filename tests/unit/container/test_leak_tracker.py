@@ -0,0 +1,119 @@
+import gc
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    Container,
+    LeakTracker,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+
+
+class SyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    def get_int(self) -> Iterator[int]:
+        yield 1
+
+
+class AsyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    async def get_int(self) -> AsyncIterator[int]:
+        yield 1
+
+
+def test_stats():
+    tracker = LeakTracker()
+    container = make_container(SyncProvider(), leak_tracker=tracker)
+    with container(), container():
+        stats = tracker.stats()
+        assert stats[Scope.REQUEST].count == 2
+        assert stats[Scope.REQUEST].oldest_age >= 0
+        assert stats[Scope.REQUEST].oldest_call_site.filename == __file__
+        assert stats[Scope.APP].count == 1
+    assert Scope.REQUEST not in tracker.stats()
+    container.close()
+    assert not tracker.open_containers()
+
+
+def test_leak_warning():
+    container = make_container(SyncProvider(), leak_tracker=LeakTracker())
+    request_container = container().__enter__()
+    request_container.get(int)
+    with pytest.warns(ResourceWarning, match="1 finalizers"):
+        del request_container
+
+
+def test_on_leak():
+    on_leak = Mock()
+    tracker = LeakTracker(capture_call_site=False, on_leak=on_leak)
+    container = make_container(SyncProvider(), leak_tracker=tracker)
+    with container() as request_container:
+        request_container.get(int)
+    del request_container
+    # not created objects are not leaked
+    container().__enter__()
+    on_leak.assert_not_called()
+
+    request_container = container().__enter__()
+    request_container.get(int)
+    del request_container
+    on_leak.assert_called_once()
+    record, exits = on_leak.call_args.args
+    assert record.scope is Scope.REQUEST
+    assert record.call_site is None
+    assert exits == 1
+
+
+class Service:
+    def __init__(self, container: Container) -> None:
+        self.container = container
+
+
+def test_finalizer_references_container():
+    class MyProvider(Provider):
+        scope = Scope.REQUEST
+
+        @provide
+        def get_service(self, container: Container) -> Iterator[Service]:
+            yield Service(container)
+
+    on_leak = Mock()
+    container = make_container(
+        MyProvider(), leak_tracker=LeakTracker(on_leak=on_leak),
+    )
+    request_container = container().__enter__()
+    request_container.get(Service)
+    ref = weakref.ref(request_container)
+    del request_container
+    gc.collect()
+    assert ref() is None
+    on_leak.assert_called_once()
+    assert on_leak.call_args.args[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_leak_async():
+    on_leak = Mock()
+    container = make_async_container(
+        AsyncProvider(), leak_tracker=LeakTracker(on_leak=on_leak),
+    )
+    request_container = await container().__aenter__()
+    await request_container.get(int)
+    records = container.registry.leak_tracker.open_containers()
+    assert [record.scope for record in records] == [
+        Scope.RUNTIME, Scope.APP, Scope.REQUEST,
+    ]
+    del request_container
+    on_leak.assert_called_once()
+    await container.close()
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+
+
+class SlowProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self, started: threading.Event, release: threading.Event):
+        super().__init__()
+        self.started = started
+        self.release = release
+        self.created = Mock()
+
+    @provide
+    def get_int(self) -> int:
+        self.created()
+        self.started.set()
+        self.release.wait(5)
+        return 1
+
+    @provide
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+    @provide
+    def get_str(self) -> str:
+        return "ok"
+
+
+def test_unrelated_not_blocked():
+    started = threading.Event()
+    release = threading.Event()
+    container = make_container(
+        SlowProvider(started, release), lock_per_key=True,
+    )
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(container.get, int)
+        assert started.wait(5)
+        assert container.get(str) == "ok"
+        release.set()
+        assert future.result() == 1
+
+
+def test_created_once():
+    started = threading.Event()
+    release = threading.Event()
+    provider = SlowProvider(started, release)
+    container = make_container(provider, lock_per_key=True)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [
+            pool.submit(container.get, dependency)
+            for dependency in (int, float, int, float)
+        ]
+        assert started.wait(5)
+        release.set()
+        results = [future.result() for future in futures]
+    assert results == [1, 0.5, 1, 0.5]
+    provider.created.assert_called_once()
+
+
+def test_not_cached_not_locked():
+    barrier = threading.Barrier(2, timeout=5)
+
+    class MyProvider(Provider):
+        @provide(scope=Scope.APP, cache=False)
+        def get_int(self) -> int:
+            # both threads must be inside the factory at the same time
+            return barrier.wait()
+
+    container = make_container(MyProvider(), lock_per_key=True)
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(container.get, int) for _ in range(2)]
+        assert sorted(future.result() for future in futures) == [0, 1]
+
+
+def test_child_container():
+    started = threading.Event()
+    release = threading.Event()
+    release.set()
+    container = make_container(SlowProvider(started, release))
+    with container(
+        lock_factory=threading.Lock,
+        lock_per_key=True,
+        scope=Scope.REQUEST,
+    ) as request_container:
+        assert request_container.get(float) == 0.5
+
+
+def test_inline_compilation():
+    provider = SlowProvider(threading.Event(), threading.Event())
+    with pytest.raises(ValueError, match="inline compilation"):
+        make_container(provider, lock_per_key=True, inline_compilation=True)
+
+
+class AsyncSlowProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self, release: asyncio.Event):
+        super().__init__()
+        self.release = release
+        self.created = Mock()
+
+    @provide
+    async def get_int(self) -> int:
+        self.created()
+        await self.release.wait()
+        return 1
+
+    @provide
+    async def get_float(self, value: int) -> float:
+        return value / 2
+
+    @provide
+    async def get_str(self) -> str:
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight():
+    release = asyncio.Event()
+    provider = AsyncSlowProvider(release)
+    container = make_async_container(provider, lock_per_key=True)
+    tasks = [
+        asyncio.create_task(container.get(dependency))
+        for dependency in (int, float, int, float)
+    ]
+    await asyncio.sleep(0)
+    assert await container.get(str) == "ok"
+    assert not any(task.done() for task in tasks)
+    release.set()
+    assert await asyncio.gather(*tasks) == [1, 0.5, 1, 0.5]
+    provider.created.assert_called_once()
+    await container.close()
+
+
+@pytest.mark.asyncio
+async def test_async_error_not_shared():
+    class FailingProvider(Provider):
+        scope = Scope.APP
+        calls = 0
+
+        @provide
+        async def get_int(self) -> int:
+            self.calls += 1
+            await asyncio.sleep(0)
+            if self.calls == 1:
+                raise ValueError
+            return self.calls
+
+    container = make_async_container(FailingProvider(), lock_per_key=True)
+    results = await asyncio.gather(
+        container.get(int), container.get(int), return_exceptions=True,
+    )
+    assert isinstance(results[0], ValueError)
+    assert results[1] == 2
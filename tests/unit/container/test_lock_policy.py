@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import UnknownScopeError
+
+
+class MyProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+
+class CustomLock:
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+
+def test_policy():
+    container = make_container(
+        MyProvider(),
+        lock_policy={Scope.APP: None, Scope.REQUEST: CustomLock},
+    )
+    assert container.lock is None
+    # entered like integrations do, without passing lock factory
+    with container() as request_container:
+        assert isinstance(request_container.lock, CustomLock)
+        assert request_container.get(str) == "1"
+        with request_container() as action_container:
+            assert action_container.lock is None
+
+
+def test_policy_overrides_argument():
+    container = make_container(
+        MyProvider(),
+        lock_policy={Scope.REQUEST: None},
+    )
+    assert isinstance(container.lock, type(threading.Lock()))
+    with container(lock_factory=CustomLock) as request_container:
+        assert request_container.lock is None
+
+
+@pytest.mark.asyncio
+async def test_policy_async():
+    container = make_async_container(
+        MyProvider(),
+        lock_policy={Scope.APP: asyncio.Lock, Scope.REQUEST: asyncio.Lock},
+    )
+    async with container() as request_container:
+        assert isinstance(request_container.lock, asyncio.Lock)
+        assert await request_container.get(str) == "1"
+
+
+def test_unknown_scope():
+    with pytest.raises(UnknownScopeError):
+        make_container(MyProvider(), lock_policy={"app": None})
@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.async_lock import MultiLoopLock
+
+
+class Client:
+    pass
+
+
+class MyProvider(Provider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.created = Mock()
+
+    @provide(scope=Scope.APP)
+    async def get_client(self) -> Client:
+        self.created()
+        await asyncio.sleep(0.01)
+        return Client()
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        self.created()
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, client: Client, value: int) -> str:
+        return str(value)
+
+
+def test_shared_between_loops():
+    provider = MyProvider()
+    container = make_async_container(provider, multi_loop=True)
+
+    async def resolve() -> Client:
+        async with container() as request_container:
+            assert await request_container.get(str) == "1"
+            return await request_container.get(Client)
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(asyncio.run, resolve()) for _ in range(8)]
+        clients = {future.result() for future in futures}
+    assert len(clients) == 1
+    assert provider.created.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_lock_cancelled_waiter():
+    lock = MultiLoopLock()
+    await lock.acquire()
+    waiter = asyncio.create_task(lock.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    lock.release()
+    assert not lock.locked()
+    async with lock:
+        assert lock.locked()
+    assert not lock.locked()
+
+
+def test_no_sync_subgraphs():
+    container = make_async_container(MyProvider())
+    assert container.registry.sync_subgraphs
+    container = make_async_container(MyProvider(), multi_loop=True)
+    # all objects are created under the lock
+    assert not container.registry.sync_subgraphs
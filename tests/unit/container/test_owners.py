@@ -0,0 +1,103 @@
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from .locks import AsyncCountingLock, CountingLock
+
+
+class MyProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+    @provide(scope=Scope.ACTION)
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+
+class AsyncProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.ACTION)
+    def get_float(self, value: int) -> float:
+        return value / 2
+
+
+def test_owners():
+    int_key = DependencyKey(int, DEFAULT_COMPONENT)
+    str_key = DependencyKey(str, DEFAULT_COMPONENT)
+    container = make_container(MyProvider())
+    assert container.registry.owners == {}
+    with container() as request_container:
+        owners = request_container.registry.owners
+        assert owners == {int_key: Scope.APP}
+        with request_container() as action_container:
+            owners = action_container.registry.owners
+            assert owners == {int_key: Scope.APP, str_key: Scope.REQUEST}
+
+
+def test_single_lock():
+    container = make_container(MyProvider(), lock_factory=CountingLock)
+    with (
+        container() as request_container,
+        request_container(lock_factory=CountingLock) as action_container,
+    ):
+        CountingLock.entered = 0
+        assert action_container.get(int) == 1
+        assert CountingLock.entered == 1  # app container only
+        assert action_container.get(float) == 0.5
+
+
+@pytest.mark.asyncio
+async def test_async_single_lock():
+    container = make_async_container(
+        AsyncProvider(), lock_factory=AsyncCountingLock,
+    )
+    async with (
+        container() as request_container,
+        request_container(lock_factory=AsyncCountingLock) as action_container,
+    ):
+        AsyncCountingLock.entered = 0
+        assert await action_container.get(int) == 1
+        assert AsyncCountingLock.entered == 1  # app container only
+        assert await action_container.get(float) == 0.5
+
+
+def test_context_of_intermediate():
+    container = make_container(MyProvider())
+    with (
+        container(context={int: 2}) as request_container,
+        request_container() as action_container,
+    ):
+        assert action_container.get(int) == 2
+        assert action_container.get(float) == 1
+
+
+@pytest.mark.asyncio
+async def test_async():
+    container = make_async_container(MyProvider())
+    async with (
+        container() as request_container,
+        request_container() as action_container,
+    ):
+        assert await action_container.get(int) == 1
+        assert await action_container.get(str) == "1"
+        assert await action_container.get(float) == 0.5
+    async with (
+        container(context={int: 2}) as request_container,
+        request_container() as action_container,
+    ):
+        assert await action_container.get(int) == 2
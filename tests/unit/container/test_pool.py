@@ -0,0 +1,88 @@
+from collections.abc import Iterator
+from typing import NewType
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    Provider,
+    Scope,
+    from_context,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.exceptions import NoContextValueError
+
+RequestId = NewType("RequestId", int)
+Handler = NewType("Handler", str)
+
+
+class MyProvider(Provider):
+    scope = Scope.REQUEST
+
+    request_id = from_context(provides=RequestId)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.finalizer = Mock()
+
+    @provide
+    def get_handler(self, request_id: RequestId) -> Iterator[Handler]:
+        yield Handler(f"handler {request_id}")
+        self.finalizer(request_id)
+
+
+def test_reuse():
+    provider = MyProvider()
+    container = make_container(provider, pool_size=1)
+    with container({RequestId: 1}) as first:
+        assert first.get(Handler) == "handler 1"
+    with container({RequestId: 2}) as second:
+        assert second is first
+        assert second.get(Handler) == "handler 2"
+    assert [c.args for c in provider.finalizer.call_args_list] == [
+        (1,), (2,),
+    ]
+
+
+def test_context_dropped():
+    container = make_container(MyProvider(), pool_size=1)
+    with container({RequestId: 1}):
+        pass
+    with (
+        container() as request_container,
+        pytest.raises(NoContextValueError),
+    ):
+        request_container.get(RequestId)
+
+
+def test_pool_size():
+    container = make_container(MyProvider(), pool_size=1)
+    with container() as first, container() as second:
+        pass
+    with container() as third, container() as fourth:
+        assert third in (first, second)
+        assert fourth not in (first, second)
+
+
+def test_scope_not_pooled():
+    container = make_container(MyProvider(), pool_size=1)
+    with container(scope=Scope.REQUEST) as first:
+        pass
+    with container(scope=Scope.REQUEST) as second:
+        assert second is not first
+
+
+@pytest.mark.asyncio
+async def test_reuse_async():
+    provider = MyProvider()
+    container = make_async_container(provider, pool_size=1)
+    async with container({RequestId: 1}) as first:
+        assert await first.get(Handler) == "handler 1"
+    async with container({RequestId: 2}) as second:
+        assert second is first
+        assert await second.get(Handler) == "handler 2"
+    assert [c.args for c in provider.finalizer.call_args_list] == [
+        (1,), (2,),
+    ]
@@ -0,0 +1,74 @@
+import gc
+import weakref
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+
+from dishka import (
+    AsyncContainer,
+    Container,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+
+
+class Service:
+    def __init__(self, container: Container | AsyncContainer) -> None:
+        self.container = container
+
+
+class SyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    def get_service(self, container: Container) -> Iterator[Service]:
+        yield Service(container)
+
+
+class AsyncProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    async def get_service(
+            self, container: AsyncContainer,
+    ) -> AsyncIterator[Service]:
+        yield Service(container)
+
+
+@pytest.fixture
+def no_gc():
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+@pytest.mark.usefixtures("no_gc")
+def test_request_scope_freed():
+    container = make_container(SyncProvider())
+    with container(context={int: 1}) as request_container:
+        assert request_container.get(Container) is request_container
+        assert request_container.get(Service).container is request_container
+        ref = weakref.ref(request_container)
+    del request_container
+    assert ref() is None
+    assert gc.collect() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("no_gc")
+async def test_request_scope_freed_async():
+    container = make_async_container(AsyncProvider())
+    async with container(context={int: 1}) as request_container:
+        assert await request_container.get(AsyncContainer) is request_container
+        service = await request_container.get(Service)
+        assert service.container is request_container
+        ref = weakref.ref(request_container)
+    del request_container, service
+    assert ref() is None
+    assert gc.collect() == 0
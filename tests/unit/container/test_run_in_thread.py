@@ -0,0 +1,133 @@
+import threading
+from collections.abc import AsyncIterable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+from dishka.provider.exceptions import InvalidFactoryOptionsError
+
+request_id: ContextVar[int] = ContextVar("request_id")
+
+
+class ThreadProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self, executor: ThreadPoolExecutor | None = None):
+        super().__init__()
+        run_in_thread = executor or True
+        self.finalizer = Mock()
+        self.provide(self.get_int, run_in_thread=run_in_thread)
+        self.provide(self.get_str, run_in_thread=run_in_thread)
+
+    def get_int(self) -> int:
+        return threading.get_ident()
+
+    def get_str(self, value: int) -> Iterable[str]:
+        yield threading.current_thread().name
+        self.finalizer(threading.current_thread().name)
+
+    @provide
+    def get_float(self, value: int) -> float:
+        return float(value)
+
+
+@pytest.mark.parametrize("inline_compilation", [False, True])
+@pytest.mark.asyncio
+async def test_default_executor(*, inline_compilation):
+    provider = ThreadProvider()
+    container = make_async_container(
+        provider, inline_compilation=inline_compilation,
+    )
+    assert await container.get(int) != threading.get_ident()
+    thread_name = await container.get(str)
+    assert thread_name != threading.current_thread().name
+    await container.close()
+    provider.finalizer.assert_called_once()
+
+
+@pytest.mark.parametrize("inline_compilation", [False, True])
+@pytest.mark.asyncio
+async def test_custom_executor(*, inline_compilation):
+    executor = ThreadPoolExecutor(thread_name_prefix="dishka_test")
+    provider = ThreadProvider(executor)
+    container = make_async_container(
+        provider, inline_compilation=inline_compilation,
+    )
+    assert (await container.get(str)).startswith("dishka_test")
+    await container.close()
+    assert provider.finalizer.call_args.args[0].startswith("dishka_test")
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_context_var():
+    class MyProvider(Provider):
+        @provide(scope=Scope.APP, run_in_thread=True)
+        def get_int(self) -> int:
+            return request_id.get()
+
+    container = make_async_container(MyProvider())
+    token = request_id.set(42)
+    try:
+        assert await container.get(int) == 42
+    finally:
+        request_id.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_not_sync_subgraph():
+    container = make_async_container(ThreadProvider())
+    sync_subgraphs = container.registry.sync_subgraphs
+    assert DependencyKey(int, DEFAULT_COMPONENT) not in sync_subgraphs
+    assert DependencyKey(float, DEFAULT_COMPONENT) not in sync_subgraphs
+
+
+@pytest.mark.asyncio
+async def test_no_yield():
+    class MyProvider(Provider):
+        @provide(scope=Scope.APP, run_in_thread=True)
+        def get_int(self) -> Iterable[int]:
+            return
+            yield
+
+    container = make_async_container(MyProvider())
+    with pytest.raises(RuntimeError):
+        await container.get(int)
+
+
+def test_sync_container():
+    provider = ThreadProvider()
+    container = make_container(provider)
+    assert container.get(int) == threading.get_ident()
+    assert container.get(str) == threading.current_thread().name
+    container.close()
+    provider.finalizer.assert_called_once_with(
+        threading.current_thread().name,
+    )
+
+
+async def get_float() -> float:
+    return 1.5
+
+
+async def get_bytes() -> AsyncIterable[bytes]:
+    yield b""
+
+
+@pytest.mark.parametrize("source", [get_float, get_bytes])
+@pytest.mark.parametrize("run_in_thread", [True, ThreadPoolExecutor(1)])
+def test_async_factory(source, run_in_thread):
+    provider = Provider(scope=Scope.APP)
+    with pytest.raises(InvalidFactoryOptionsError, match="run_in_thread"):
+        provider.provide(source, run_in_thread=run_in_thread)
@@ -0,0 +1,94 @@
+from typing import Generic, TypeVar
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    Container,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+
+T = TypeVar("T")
+
+
+class Repo(Generic[T]):
+    def __init__(self, value: T) -> None:
+        self.value = value
+
+
+class MyProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return 1
+
+    @provide
+    def get_str(self, value: int) -> str:
+        return str(value)
+
+    repo = provide(Repo)
+
+
+def test_dense_slots():
+    container = make_container(MyProvider())
+    with container() as request_container:
+        slots = request_container.registry.slots
+        assert sorted(slots.values()) == list(range(len(slots)))
+        # container itself is not cached
+        assert set(slots) == set(request_container.registry.factories) - {
+            DependencyKey(Container, DEFAULT_COMPONENT),
+        }
+
+
+@pytest.mark.parametrize("inline_compilation", [False, True])
+def test_slot_added_later(*, inline_compilation):
+    container = make_container(
+        MyProvider(),
+        inline_compilation=inline_compilation,
+    )
+    with container() as first, container() as second:
+        size = len(first.registry.slots)
+        repo = first.get(Repo[str])
+        assert repo.value == "1"
+        assert len(first.registry.slots) > size
+        assert first.get(Repo[str]) is repo
+
+        other_repo = second.get(Repo[str])
+        assert other_repo is not repo
+        assert second.get(Repo[str]) is other_repo
+
+
+@pytest.mark.asyncio
+async def test_slot_added_later_async():
+    container = make_async_container(MyProvider())
+    async with container() as first, container() as second:
+        repo = await first.get(Repo[str])
+        assert await first.get(Repo[str]) is repo
+        assert await second.get(Repo[str]) is not repo
+
+
+def test_unknown_context():
+    container = make_container(MyProvider())
+    with container(context={float: 1.5, int: 2}) as request_container:
+        assert request_container.get(float) == 1.5
+        assert request_container.get(int) == 2
+        assert request_container.get(str) == "2"
+    assert container.get(int) == 1
+
+
+def test_context_proxy():
+    container = make_container(MyProvider())
+    with container() as request_container:
+        request_container.get(str)
+        with pytest.deprecated_call():
+            context = request_container.context
+        assert context[DependencyKey(str, DEFAULT_COMPONENT)] == "1"
+        assert DependencyKey(int, DEFAULT_COMPONENT) not in context
+        context[DependencyKey(float, DEFAULT_COMPONENT)] = 1.5
+        assert request_container.get(float) == 1.5
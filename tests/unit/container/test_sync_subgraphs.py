@@ -0,0 +1,94 @@
+from collections.abc import Iterable
+from typing import NewType
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import (
+    DEFAULT_COMPONENT,
+    DependencyKey,
+    Provider,
+    Scope,
+    make_async_container,
+    make_container,
+    provide,
+)
+
+AsyncInt = NewType("AsyncInt", int)
+SyncInt = NewType("SyncInt", int)
+
+
+class MyProvider(Provider):
+    def __init__(self, finalizer: Mock):
+        super().__init__()
+        self.finalizer = finalizer
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> Iterable[int]:
+        yield 1
+        self.finalizer()
+
+    @provide(scope=Scope.APP)
+    async def get_async(self, value: int) -> AsyncInt:
+        return AsyncInt(value + 1)
+
+    @provide(scope=Scope.REQUEST)
+    def get_sync(self, value: int) -> SyncInt:
+        return SyncInt(value + 2)
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: AsyncInt, sync_value: SyncInt) -> str:
+        return f"{value} {sync_value}"
+
+
+def key(hint):
+    return DependencyKey(hint, DEFAULT_COMPONENT)
+
+
+@pytest.mark.parametrize("inline_compilation", [False, True])
+@pytest.mark.asyncio
+async def test_sync_subgraph(*, inline_compilation):
+    finalizer = Mock()
+    container = make_async_container(
+        MyProvider(finalizer),
+        inline_compilation=inline_compilation,
+    )
+    assert key(int) in container.registry.sync_subgraphs
+    assert key(AsyncInt) not in container.registry.sync_subgraphs
+
+    async with container() as request_container:
+        sync_subgraphs = request_container.registry.sync_subgraphs
+        assert key(SyncInt) in sync_subgraphs
+        assert key(int) in sync_subgraphs
+        assert key(str) not in sync_subgraphs
+
+        assert await request_container.get(SyncInt) == 3
+        assert await request_container.get(str) == "2 3"
+        assert key(SyncInt) in request_container.registry.compiled
+        assert key(SyncInt) not in request_container.registry.compiled_async
+        assert key(str) in request_container.registry.compiled_async
+        assert key(str) not in request_container.registry.compiled
+
+    assert key(int) in container.registry.compiled
+    assert key(AsyncInt) in container.registry.compiled_async
+    await container.close()
+    finalizer.assert_called_once()
+
+
+class SyncProvider(Provider):
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_sync(self, value: int) -> SyncInt:
+        return SyncInt(value + 2)
+
+
+def test_sync_container_no_subgraphs():
+    container = make_container(SyncProvider())
+    assert not container.registry.sync_subgraphs
+    with container() as request_container:
+        assert not request_container.registry.sync_subgraphs
+        assert request_container.get(SyncInt) == 3
+    container.close()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import Provider, Scope, make_async_container, provide
+
+
+class Client:
+    pass
+
+
+class MyProvider(Provider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.created = Mock()
+
+    @provide(scope=Scope.APP)
+    async def get_client(self) -> Client:
+        return Client()
+
+    @provide(scope=Scope.APP)
+    def get_int(self) -> int:
+        self.created()
+        return 1
+
+    @provide(scope=Scope.REQUEST)
+    def get_str(self, value: int) -> str:
+        self.created()
+        return str(value)
+
+    @provide(scope=Scope.REQUEST)
+    def get_float(self, client: Client, value: int) -> float:
+        return float(value)
+
+
+@pytest.mark.asyncio
+async def test_sync_dependency():
+    provider = MyProvider()
+    container = make_async_container(provider)
+    async with container() as request_container:
+        view = request_container.sync_view()
+        threads = [
+            threading.Thread(target=view.get, args=(str,))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert await request_container.get(str) == "1"
+        assert provider.created.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_dependency():
+    container = make_async_container(MyProvider())
+    async with container() as request_container:
+        view = request_container.sync_view()
+        value = await asyncio.to_thread(view.get, float)
+        assert value == 1.0
+        client = await asyncio.to_thread(view.get, Client)
+        assert client is await request_container.get(Client)
+        # cached value is returned without event loop
+        assert view.get(float) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_async_dependency_in_loop():
+    container = make_async_container(MyProvider())
+    view = container.sync_view()
+    with pytest.raises(RuntimeError):
+        view.get(Client)
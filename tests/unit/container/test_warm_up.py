@@ -0,0 +1,136 @@
+import threading
+import time
+from collections.abc import Iterator
+from typing import Generic, NewType, TypeVar
+from unittest.mock import Mock
+
+import pytest
+
+from dishka import Provider, Scope, make_container, provide
+
+HttpClient = NewType("HttpClient", str)
+S3Client = NewType("S3Client", str)
+Engine = NewType("Engine", str)
+T = TypeVar("T")
+
+
+class Service:
+    def __init__(self, http: HttpClient, s3: S3Client) -> None:
+        self.http = http
+        self.s3 = s3
+
+
+class Handler:
+    def __init__(self, service: Service, engine: Engine) -> None:
+        self.service = service
+        self.engine = engine
+
+
+class MyProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(3, timeout=1)
+        self.finalizer = Mock()
+
+    @provide
+    def get_http(self) -> Iterator[HttpClient]:
+        self.barrier.wait()
+        yield HttpClient("http")
+        self.finalizer("http")
+
+    @provide
+    def get_s3(self) -> S3Client:
+        self.barrier.wait()
+        return S3Client("s3")
+
+    @provide
+    def get_engine(self) -> Engine:
+        self.barrier.wait()
+        return Engine("engine")
+
+    @provide
+    def get_service(self, http: HttpClient, s3: S3Client) -> Iterator[Service]:
+        yield Service(http, s3)
+        self.finalizer("service")
+
+    handler = provide(Handler, scope=Scope.REQUEST)
+
+
+def test_warm_up():
+    provider = MyProvider()
+    container = make_container(provider)
+    container.warm_up(max_workers=4)
+    assert provider.barrier.n_waiting == 0
+    service = container.get(Service)
+    with container() as request_container:
+        assert request_container.get(Handler).service is service
+    container.close()
+    assert [c.args for c in provider.finalizer.call_args_list] == [
+        ("service",), ("http",),
+    ]
+
+
+def test_warm_up_selected():
+    provider = MyProvider()
+    provider.barrier = threading.Barrier(2, timeout=1)
+    container = make_container(provider)
+    # engine is not created, otherwise barrier would be broken
+    container.warm_up([Service])
+    assert container.get(Service).s3 == "s3"
+
+
+def test_warm_up_error():
+    class FailingProvider(Provider):
+        @provide(scope=Scope.APP)
+        def get_int(self) -> int:
+            raise ValueError("int")
+
+        @provide(scope=Scope.APP)
+        def get_str(self, value: int) -> str:
+            return str(value)
+
+    container = make_container(FailingProvider())
+    with pytest.raises(ValueError, match="int"):
+        container.warm_up()
+
+
+class Repo(Generic[T]):
+    pass
+
+
+class UserService:
+    def __init__(self, repo: Repo[int]) -> None:
+        self.repo = repo
+
+
+class OrderService:
+    def __init__(self, repo: Repo[int]) -> None:
+        self.repo = repo
+
+
+class GenericProvider(Provider):
+    scope = Scope.APP
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.created = Mock()
+
+    @provide
+    def get_repo(self, type_: type[T]) -> Repo[T]:
+        self.created()
+        # other thread would create it too if it was not in the graph
+        time.sleep(0.05)
+        return Repo()
+
+    users = provide(UserService)
+    orders = provide(OrderService)
+
+
+def test_generic_dependency():
+    provider = GenericProvider()
+    container = make_container(provider, skip_validation=True)
+    container.warm_up([UserService, OrderService], max_workers=2)
+    provider.created.assert_called_once()
+    assert container.get(UserService).repo is container.get(OrderService).repo